@@ -0,0 +1,248 @@
+import io, os, threading
+from functools import lru_cache
+from itertools import combinations
+from interests import SEPARATORS, SPACES, extract_interests
+from metrics import span, timed
+
+# Most distinct keys any one aggregate holds, which bounds a report's memory whatever the row count
+MAX_KEYS = int(os.environ.get("INTERNS_ANALYTICS_MAX_KEYS", "10000"))
+# Skills past this many in one row don't add co-occurrence pairs (n skills make n*(n-1)/2 pairs)
+MAX_SKILLS_PER_ROW = 20
+TOP_PAIRS = 50
+CHARTS = ("interests-by-branch", "interests-by-year", "skill-pairs", "cohorts")
+
+
+class BoundedCounter:
+    """Counts keys in at most capacity entries (Misra-Gries, a half at a time).
+
+    When full, the median count is subtracted from every entry and the ones
+    left at zero or below are dropped; error adds up what was subtracted.
+    Every reported count is then at most error below the true one and never
+    above it, keys counted more than error times are never lost, and error
+    stays under 2 * total / capacity. While error is 0 the counts are exact.
+    """
+    def __init__(self, capacity=MAX_KEYS):
+        self.capacity = capacity
+        self.counts = {}
+        self.error = 0
+
+    def add(self, key, n=1):
+        counts = self.counts
+        if key in counts:
+            counts[key] += n
+            return
+        counts[key] = n
+        if len(counts) > self.capacity:
+            cut = sorted(counts.values())[len(counts) // 2]
+            self.counts = {k: c - cut for k, c in counts.items() if c > cut}
+            self.error += cut
+
+    def most_common(self, n=None):
+        items = sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        return items if n is None else items[:n]
+
+
+class Labels:
+    """Case-insensitive grouping that reports the first spelling seen"""
+    def __init__(self, capacity=MAX_KEYS):
+        self.capacity = capacity
+        self._labels = {}
+        # Raw value -> key, rows repeat the same few spellings
+        self._keys = {}
+
+    def key(self, value):
+        key = self._keys.get(value)
+        if key is not None:
+            return key
+        label = SPACES.sub(" ", str(value or "")).strip()
+        key = label.lower()
+        if len(self._keys) < self.capacity:
+            self._keys[value] = key
+            if key and key not in self._labels:
+                self._labels[key] = label
+        return key
+
+    def __getitem__(self, key):
+        return self._labels.get(key, key)
+
+
+@lru_cache(maxsize=8192)
+def split_skills(value):
+    return tuple(s for s in (SPACES.sub(" ", part).strip() for part in SEPARATORS.split(str(value or ""))) if s)
+
+
+class Report:
+    """Aggregates built in one pass over the rows, in memory bounded by MAX_KEYS per aggregate"""
+    def __init__(self, capacity=MAX_KEYS):
+        self.rows = 0
+        self.labels = Labels(capacity)
+        self.by_branch = BoundedCounter(capacity)
+        self.by_year = BoundedCounter(capacity)
+        self.pairs = BoundedCounter(capacity)
+        self.cohorts = BoundedCounter(capacity)
+
+    def add(self, student):
+        self.rows += 1
+        branch = self.labels.key(student.get('branch')) or "unknown"
+        year = self.labels.key(student.get('year')) or "unknown"
+        for interest in extract_interests(student.get('interest')):
+            self.by_branch.add((branch, interest))
+            self.by_year.add((year, interest))
+        skills = sorted({self.labels.key(s) for s in split_skills(str(student.get('skills') or ''))[:MAX_SKILLS_PER_ROW]})
+        for pair in combinations(skills, 2):
+            self.pairs.add(pair)
+        # Records added before created_at was stamped have no cohort
+        self.cohorts.add(str(student.get('created_at') or '')[:7] or "unknown")
+
+    def _grouped(self, counter):
+        groups = {}
+        for (group, interest), n in counter.most_common():
+            groups.setdefault(self.labels[group], {})[interest] = n
+        return groups
+
+    def as_dict(self):
+        months = sorted(m for m in self.cohorts.counts if m != "unknown")
+        cohorts, total = [], self.cohorts.counts.get("unknown", 0)
+        for month in months:
+            total += self.cohorts.counts[month]
+            cohorts.append({"month": month, "added": self.cohorts.counts[month], "total": total})
+        counters = (self.by_branch, self.by_year, self.pairs, self.cohorts)
+        return {
+            "rows": self.rows,
+            # Counts may be low by up to this much once an aggregate outgrew MAX_KEYS
+            "max_error": max(c.error for c in counters),
+            "interests_by_branch": self._grouped(self.by_branch),
+            "interests_by_year": self._grouped(self.by_year),
+            "skill_pairs": [{"skills": [self.labels[a], self.labels[b]], "count": n}
+                            for (a, b), n in self.pairs.most_common(TOP_PAIRS)],
+            "cohorts": cohorts,
+            "without_cohort": self.cohorts.counts.get("unknown", 0),
+        }
+
+
+# ----------------- SOURCES -----------------
+def stream_workbook(excel_file):
+    """Rows of a workbook as dicts, read with openpyxl's read-only mode so memory stays flat"""
+    from openpyxl import load_workbook
+    wb = load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = [str(h) if h is not None else "" for h in next(rows, ())]
+        for values in rows:
+            yield dict(zip(header, values))
+    finally:
+        wb.close()
+
+
+def stream_database(db_file, table="students", batch=1000):
+    """Rows of a SQLiteStorage table through a cursor, batch rows at a time"""
+    import json, sqlite3
+    db = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)
+    try:
+        cursor = db.execute(f"SELECT * FROM {table}")
+        columns = [c[0] for c in cursor.description]
+        while rows := cursor.fetchmany(batch):
+            for row in rows:
+                record = dict(zip(columns, row))
+                extra = record.pop("extra", None)
+                if extra:
+                    record.update(json.loads(extra))
+                yield record
+    finally:
+        db.close()
+
+
+def build_report(rows, capacity=MAX_KEYS):
+    report = Report(capacity)
+    for row in rows:
+        report.add(row)
+    return report.as_dict()
+
+
+# ----------------- CHARTS -----------------
+def _stacked(ax, groups, title, top=8):
+    names = sorted(groups, key=lambda g: -sum(groups[g].values()))[:top]
+    totals = {}
+    for g in names:
+        for interest, n in groups[g].items():
+            totals[interest] = totals.get(interest, 0) + n
+    interests = sorted(totals, key=lambda i: -totals[i])[:top]
+    left = [0] * len(names)
+    for interest in interests:
+        counts = [groups[g].get(interest, 0) for g in names]
+        ax.barh(names, counts, left=left, label=interest)
+        left = [a + b for a, b in zip(left, counts)]
+    ax.invert_yaxis()
+    ax.set_title(title)
+    ax.legend(fontsize="small", loc="lower right")
+
+
+@timed("analytics_chart")
+def render(name, report):
+    """PNG of one of CHARTS; the Figure API needs no pyplot state, so workers can render at once"""
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(8, 5))
+    ax = fig.add_subplot()
+    if name == "interests-by-branch":
+        _stacked(ax, report["interests_by_branch"], "Interests by branch")
+    elif name == "interests-by-year":
+        _stacked(ax, report["interests_by_year"], "Interests by year")
+    elif name == "skill-pairs":
+        pairs = report["skill_pairs"][:15]
+        ax.barh([" + ".join(p["skills"]) for p in pairs], [p["count"] for p in pairs], color="#4361ee")
+        ax.invert_yaxis()
+        ax.set_title("Skills most often listed together")
+    elif name == "cohorts":
+        cohorts = report["cohorts"]
+        months = [c["month"] for c in cohorts]
+        ax.bar(months, [c["added"] for c in cohorts], color="#4361ee", label="added")
+        ax.plot(months, [c["total"] for c in cohorts], color="#3a0ca3", marker="o", label="total")
+        ax.tick_params(axis="x", labelrotation=45)
+        ax.set_title("Interns added per month")
+        ax.legend()
+    else:
+        raise ValueError(f"Unknown chart: {name}")
+    fig.tight_layout()
+    img = io.BytesIO()
+    fig.savefig(img, format="png")
+    return img.getvalue()
+
+
+# ----------------- APP -----------------
+class Analytics:
+    """Reports over a StudentManager, computed once per data version.
+
+    The pass runs over the manager's records in place (no DataFrame, no
+    copy of the table), and concurrent requests for the same version wait
+    for one computation instead of each doing their own.
+    """
+    def __init__(self, manager, capacity=MAX_KEYS):
+        self.manager = manager
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._version = None
+        self._report = None
+        self._charts = {}
+
+    def report(self):
+        """(report dict, version) for the current data"""
+        version = self.manager.version()
+        with self._lock:
+            if version != self._version:
+                report = Report(self.capacity)
+                with span("analytics_scan"):
+                    self.manager.scan(report.add)
+                self._report, self._version, self._charts = report.as_dict(), version, {}
+            return self._report, self._version
+
+    def chart(self, name):
+        """(png, version) of one of CHARTS for the current data"""
+        report, version = self.report()
+        with self._lock:
+            png = self._charts.get(name) if version == self._version else None
+        if png is None:
+            png = render(name, report)
+            with self._lock:
+                if version == self._version:
+                    self._charts[name] = png
+        return png, version
@@ -0,0 +1,273 @@
+import gzip, hmac, json, os, threading, time
+from flask import Blueprint, Response, jsonify, request, session, url_for
+
+# Without INTERNS_API_TOKEN only logged-in browser sessions can use the API
+API_TOKEN = os.environ.get("INTERNS_API_TOKEN")
+MAX_BATCH = 1000
+MAX_CHANGES = 1000
+# Longest a /changes long-poll may wait, and how often an idle event stream sends a keepalive
+MAX_WAIT_SECONDS = 30
+KEEPALIVE_SECONDS = 15
+# Long-polls and event streams hold a request thread while open, so only this many run at once per worker
+MAX_WAITERS = int(os.environ.get("INTERNS_MAX_WAITERS", "8"))
+# An event stream ends after this long and the client reconnects from Last-Event-ID; some servers
+# never report a vanished client, and this bounds how long its stream can hold a slot
+MAX_STREAM_SECONDS = 300
+# Smaller bodies aren't worth compressing
+COMPRESS_MIN_BYTES = 1024
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class ApiError(Exception):
+    def __init__(self, status, message, headers=None, **details):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+        self.body = dict(error=message, **details)
+
+
+def compress(response):
+    """gzip or brotli encode a buffered response the client accepts"""
+    if (response.direct_passthrough or response.is_streamed or response.status_code < 200 or response.status_code in (204, 304)
+            or "Content-Encoding" in response.headers):
+        return response
+    response.vary.add("Accept-Encoding")
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        body, encoding = brotli.compress(body, quality=5), "br"
+    elif accepted["gzip"]:
+        body, encoding = gzip.compress(body, compresslevel=5), "gzip"
+    else:
+        return response
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def create_api(manager, list_students, fields, required):
+    """Versioned JSON API over a StudentManager, to be registered at /api/v1"""
+    api = Blueprint("api_v1", __name__)
+    known = set(fields)
+    waiters = threading.BoundedSemaphore(MAX_WAITERS)
+
+    @api.before_request
+    def authorize():
+        if "user" in session:
+            return None
+        auth = request.headers.get("Authorization", "")
+        if API_TOKEN and auth.startswith("Bearer ") and hmac.compare_digest(auth[7:], API_TOKEN):
+            return None
+        return jsonify({"error": "authentication required"}), 401
+
+    @api.after_request
+    def encode(response):
+        return compress(response)
+
+    @api.errorhandler(ApiError)
+    def api_error(e):
+        return jsonify(e.body), e.status, e.headers
+
+    # ----- helpers -----
+    def projection():
+        """Fields asked for with ?fields=name,email (id always included), or None for all"""
+        wanted = [f.strip() for f in request.args.get("fields", "").split(",") if f.strip()]
+        if not wanted:
+            return None
+        unknown = [f for f in wanted if f not in known and f != "id"]
+        if unknown:
+            raise ApiError(400, "Unknown fields", fields=unknown)
+        return ["id"] + [f for f in wanted if f != "id"]
+
+    def project(student, wanted):
+        if wanted is None:
+            return student
+        return {f: student.get(f) for f in wanted}
+
+    def body():
+        data = request.get_json(silent=True)
+        if data is None:
+            raise ApiError(400, "Expected a JSON body")
+        return data
+
+    def clean(data, partial=False):
+        """Known fields as stripped strings, or a list of problems"""
+        if not isinstance(data, dict):
+            return None, ["expected an object"]
+        problems = [f"unknown field: {k}" for k in data if k not in known and k != "id"]
+        student = {k: "" if v is None else str(v).strip() for k, v in data.items() if k in known}
+        if not partial:
+            student = {f: student.get(f, "") for f in fields}
+        problems += [f"missing {f}" for f in required if f in student and not student[f]]
+        return student, problems
+
+    def student_id(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    def int_arg(name, default, low, high):
+        try:
+            value = int(request.args.get(name, default))
+        except ValueError:
+            raise ApiError(400, f"{name} must be an integer")
+        return min(max(value, low), high)
+
+    def gone(changelog):
+        return ApiError(410, "Changes are no longer retained, resync from /interns",
+                        first_seq=changelog.first_seq(), last_seq=changelog.latest())
+
+    def wait_slot():
+        """Take one of the MAX_WAITERS slots, or answer 503 so the client backs off"""
+        if not waiters.acquire(blocking=False):
+            raise ApiError(503, "Too many consumers waiting for changes, retry later",
+                           headers={"Retry-After": str(KEEPALIVE_SECONDS)})
+
+    # ----- routes -----
+    @api.get("/interns")
+    def list_interns():
+        wanted = projection()
+        # Read first, so replaying /changes from here misses nothing
+        seq = manager.changelog.latest()
+        listing = list_students(request.args)
+        return jsonify({
+            "data": [project(s, wanted) for s in listing["students"]],
+            "seq": seq,
+            "total": listing["total"],
+            "page": listing["page"],
+            "pages": listing["pages"],
+            "per_page": listing["per_page"],
+        })
+
+    @api.get("/interns/<int:sid>")
+    def get_intern(sid):
+        student = manager.get_student(sid)
+        if student is None:
+            raise ApiError(404, "Intern not found", id=sid)
+        return jsonify(project(student, projection()))
+
+    @api.post("/interns")
+    def create_intern():
+        student, problems = clean(body())
+        if problems:
+            raise ApiError(422, "Invalid intern", problems=problems)
+        sid = manager.add_students([student])[0]
+        response = jsonify(manager.get_student(sid) or dict(student, id=sid))
+        response.status_code = 201
+        response.headers["Location"] = url_for(".get_intern", sid=sid)
+        return response
+
+    @api.route("/interns/<int:sid>", methods=["PUT", "PATCH"])
+    def update_intern(sid):
+        student, problems = clean(body(), partial=request.method == "PATCH")
+        if problems:
+            raise ApiError(422, "Invalid intern", problems=problems)
+        if not manager.apply_batch(updates=[dict(student, id=sid)])[1]:
+            raise ApiError(404, "Intern not found", id=sid)
+        return jsonify(project(manager.get_student(sid), projection()))
+
+    @api.delete("/interns/<int:sid>")
+    def delete_intern(sid):
+        if not manager.apply_batch(deletes=[sid])[2]:
+            raise ApiError(404, "Intern not found", id=sid)
+        return "", 204
+
+    @api.post("/interns/batch")
+    def batch():
+        """Apply {"create": [...], "update": [{"id": .., ...}], "delete": [ids]} in one commit, or nothing"""
+        data = body()
+        if not isinstance(data, dict):
+            raise ApiError(400, "Expected an object with create, update and/or delete lists")
+        creates, updates, deletes = data.get("create") or [], data.get("update") or [], data.get("delete") or []
+        if not all(isinstance(x, list) for x in (creates, updates, deletes)):
+            raise ApiError(400, "create, update and delete must be lists")
+        if len(creates) + len(updates) + len(deletes) > MAX_BATCH:
+            raise ApiError(413, f"At most {MAX_BATCH} changes per batch")
+        errors, new_students, changes, delete_ids = [], [], [], []
+        for i, item in enumerate(creates):
+            student, problems = clean(item)
+            if problems:
+                errors.append({"create": i, "problems": problems})
+            new_students.append(student)
+        for i, item in enumerate(updates):
+            sid = student_id(item.get("id")) if isinstance(item, dict) else None
+            student, problems = clean(item, partial=True)
+            if sid is None:
+                problems.append("id required")
+            elif manager.get_student(sid) is None:
+                problems.append("not found")
+            if problems:
+                errors.append({"update": i, "problems": problems})
+            else:
+                changes.append(dict(student, id=sid))
+        for i, value in enumerate(deletes):
+            sid = student_id(value)
+            if sid is None or manager.get_student(sid) is None:
+                errors.append({"delete": i, "problems": ["not found"]})
+            delete_ids.append(sid)
+        if errors:
+            raise ApiError(422, "Nothing was changed", errors=errors)
+        added, updated, deleted = manager.apply_batch(new_students, changes, delete_ids)
+        return jsonify({"created": added, "updated": updated, "deleted": deleted})
+
+    @api.get("/changes")
+    def changes():
+        """Events after ?since=N, waiting up to ?wait= seconds for the first one (long-polling)"""
+        changelog = manager.changelog
+        since = int_arg("since", 0, 0, 1 << 62)
+        limit = int_arg("limit", MAX_CHANGES, 1, MAX_CHANGES)
+        wait = int_arg("wait", 0, 0, MAX_WAIT_SECONDS)
+        if wait:
+            wait_slot()
+            try:
+                events = changelog.wait(since, wait, limit)
+            finally:
+                waiters.release()
+        else:
+            events = changelog.since(since, limit)
+        if events is None:
+            raise gone(changelog)
+        last = events[-1]["seq"] if events else since
+        return jsonify({"data": events, "last_seq": last, "more": last < changelog.latest()})
+
+    @api.get("/changes/stream")
+    def change_stream():
+        """The same events as Server-Sent Events, resuming after Last-Event-ID or ?since=N"""
+        changelog = manager.changelog
+        since = request.headers.get("Last-Event-ID") or request.args.get("since", "0")
+        try:
+            since = max(int(since), 0)
+        except ValueError:
+            raise ApiError(400, "since must be an integer")
+        if changelog.since(since, 1) is None:
+            raise gone(changelog)
+
+        def stream(seq):
+            yield "retry: 3000\n\n"
+            deadline = time.monotonic() + MAX_STREAM_SECONDS
+            while (remaining := deadline - time.monotonic()) > 0:
+                events = changelog.wait(seq, min(remaining, KEEPALIVE_SECONDS), MAX_CHANGES)
+                if events is None:
+                    yield "event: resync\ndata: {}\n\n"
+                    return
+                if not events:
+                    yield ": keepalive\n\n"
+                for event in events:
+                    seq = event["seq"]
+                    yield f"id: {seq}\nevent: change\ndata: {json.dumps(event, default=str)}\n\n"
+
+        wait_slot()
+        response = Response(stream(since), mimetype="text/event-stream",
+                            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+        # Called when the stream ends, or when the server notices the client has gone
+        response.call_on_close(waiters.release)
+        return response
+
+    return api
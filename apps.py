@@ -1,248 +1,267 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash
-import pandas as pd, os, re, secrets
+from flask import Flask, render_template, request, redirect, url_for, session, flash, Response, abort, jsonify
+import os
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt, io, base64
-from collections import Counter
+import io, atexit, hashlib, threading, time
+from collections import OrderedDict
+from storage import make_storage
+from students import StudentManager
+from stats import DashboardStats
+from search import SearchIndex
+from user_store import LoginsBusy, UserStore
+from interests import extract_interests
+from bulk import iter_upload_rows, chunked, stream_csv, stream_xlsx
+import metrics
+from jobs import JobQueue
+from api import create_api
+from tokens import make_token_store
+from assets import Assets
+import analytics
+from metrics import timed, log_event
 
 app = Flask(__name__)
 app.secret_key = "secret123"
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
-
-EXCEL_FILE = "interns.xlsx"
-REGISTRATION_FILE = "registers.xlsx"
-users_db, reset_tokens = [], {}
+# Render missing values (empty Excel cells) as blanks rather than "None"
+app.jinja_env.finalize = lambda value: "" if value is None else value
+
+EXCEL_FILE = os.environ.get("INTERNS_EXCEL_FILE", "interns.xlsx")
+REGISTRATION_FILE = os.environ.get("INTERNS_REGISTRATION_FILE", "registers.xlsx")
+# "journal" appends each change and rewrites the workbook in the background,
+# "excel" rewrites the whole workbook on every change, "sqlite" keeps records
+# in a database next to each workbook
+STORAGE_BACKEND = os.environ.get("INTERNS_STORAGE", "journal")
+# With sqlite, regenerate the workbooks from the database this often (seconds, 0 = never)
+EXPORT_INTERVAL = int(os.environ.get("INTERNS_EXPORT_INTERVAL", "0"))
+PER_PAGE, MAX_PER_PAGE = 25, 200
+STUDENT_FIELDS = ["name", "email", "phone", "education", "branch", "year", "skills", "interest"]
+REQUIRED_FIELDS = ["name", "email", "phone", "education", "branch", "year"]
+IMPORT_CHUNK_SIZE = 1000
+# Keep interns column by column (needs numpy), leaner and faster to aggregate for large cohorts
+COLUMNAR_STORE = os.environ.get("INTERNS_COLUMNAR") == "1"
+# werkzeug hash spec, raise the iteration count as hardware gets faster
+PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "pbkdf2:sha256:600000")
+# Logins verifying a password at once per worker, past that /login answers 503 instead of tying up more threads
+LOGIN_SLOTS = int(os.environ.get("INTERNS_LOGIN_SLOTS", "4"))
+# Threads for background work: workbook compaction and chart rendering
+JOB_WORKERS = int(os.environ.get("INTERNS_JOB_WORKERS", "2"))
+# "sqlite" shares reset tokens and rate limits between worker processes and restarts, "memory" keeps them per process
+TOKEN_STORE = os.environ.get("INTERNS_TOKEN_STORE", "sqlite")
+TOKEN_DB = os.environ.get("INTERNS_TOKEN_DB", os.path.join(os.path.dirname(REGISTRATION_FILE), "tokens.db"))
+RESET_TOKEN_TTL = 24 * 3600
+MAX_RESET_TOKENS = 10000
+# Password reset requests allowed per email address per hour
+RESET_RATE_LIMIT = int(os.environ.get("INTERNS_RESET_RATE_LIMIT", "3"))
+TOKEN_SWEEP_INTERVAL = 300
+# Built-in accounts, checked after the registered users
 users = {
     "user1@example.com": {"username": "user1", "password": "pass1", "name": "Vignesh"},
     "admin": {"username": "admin", "password": "admin123", "name": "Administrator"},
     "user1": {"username": "user1", "password": "pass1", "name": "Vignesh"}
 }
 
-# ----------------- EXCEL FUNCTIONS FOR USER REGISTRATION -----------------
-def save_user_to_excel(user_data):
-    """Save user registration data to Excel file"""
-    try:
-        df_new = pd.DataFrame([user_data])
-        
-        if os.path.exists(REGISTRATION_FILE):
-            # Append to existing file
-            df_existing = pd.read_excel(REGISTRATION_FILE)
-            df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-        else:
-            # Create new file
-            df_combined = df_new
-        
-        # Save to Excel
-        df_combined.to_excel(REGISTRATION_FILE, index=False)
-        return True
-    except Exception as e:
-        print(f"Error saving user to Excel: {e}")
-        return False
+# ----------------- BACKGROUND JOBS -----------------
+jobs = JobQueue(workers=JOB_WORKERS)
 
-def load_users_from_excel():
-    """Load users from Excel file into memory"""
-    if not os.path.exists(REGISTRATION_FILE):
-        return []
-    
-    try:
-        df = pd.read_excel(REGISTRATION_FILE)
-        users = df.to_dict('records')
-        return users
-    except Exception as e:
-        print(f"Error loading users from Excel: {e}")
-        return []
+# ----------------- USER STORE -----------------
+user_store = UserStore(make_storage(REGISTRATION_FILE, STORAGE_BACKEND, key="username", jobs=jobs,
+                                    export_interval=EXPORT_INTERVAL),
+                       hash_method=PASSWORD_HASH_METHOD, builtin=users, login_slots=LOGIN_SLOTS)
+atexit.register(user_store.close)
+print(f"Loaded {len(user_store)} users from Excel file")
 
-def check_existing_user(username, email):
-    """Check if username or email already exists in Excel"""
-    if not os.path.exists(REGISTRATION_FILE):
-        return False
-    
-    try:
-        df = pd.read_excel(REGISTRATION_FILE)
-        
-        # Check if username exists
-        if not df[df['username'] == username].empty:
-            return True
-        
-        # Check if email exists
-        if not df[df['email'] == email].empty:
-            return True
-        
-        return False
-    except Exception as e:
-        print(f"Error checking existing user: {e}")
-        return False
-
-def authenticate_from_excel(username, password):
-    """Authenticate user from Excel file"""
-    if not os.path.exists(REGISTRATION_FILE):
-        print("Excel file not found")
-        return None
-    
-    try:
-        df = pd.read_excel(REGISTRATION_FILE)
-        print(f"Excel columns: {df.columns.tolist()}")
-        print(f"Looking for user: {username}")
-        
-        # Check if username/email and password match
-        user_row = df[
-            ((df['username'] == username) | (df['email'] == username)) & 
-            (df['password'] == password)
-        ]
-        
-        print(f"Found {len(user_row)} matching users")
-        
-        if not user_row.empty:
-            user_data = user_row.iloc[0].to_dict()
-            print(f"User found: {user_data}")
-            return {
-                "fullname": user_data.get('fullname', ''),
-                "username": user_data.get('username', ''),
-                "email": user_data.get('email', ''),
-                "password": user_data.get('password', ''),
-                "created_at": user_data.get('created_at', '')
-            }
-        
-        return None
-    except Exception as e:
-        print(f"Error reading Excel file for authentication: {e}")
-        return None
-
-# Load existing users from Excel on startup
-def load_all_users():
-    """Load all registered users from Excel on startup"""
-    global users_db
-    
-    excel_users = load_users_from_excel()
-    if excel_users:
-        users_db.extend(excel_users)
-        
-        # Also populate the users dict for backward compatibility
-        for user in excel_users:
-            users[user['email']] = {
-                "username": user['username'],
-                "password": user['password'],
-                "name": user['fullname']
-            }
-        print(f"Loaded {len(excel_users)} users from Excel file")
-
-# Initialize users on app start
-load_all_users()
-
-# ----------------- STUDENT MANAGEMENT -----------------
-class StudentManager:
-    def __init__(self, excel_file):
-        self.excel_file = excel_file
-        self.students = []
-        self.next_id = 1
-        self.load_from_excel()
-
-    def load_from_excel(self):
-        """Load students from Excel file on startup"""
-        if os.path.exists(self.excel_file):
-            df = pd.read_excel(self.excel_file)
-            if not df.empty:
-                # Convert DataFrame to list of dictionaries
-                self.students = df.to_dict('records')
-                # Set next_id based on existing data
-                if self.students:
-                    max_id = max(int(student.get('id', 0)) for student in self.students)
-                    self.next_id = max_id + 1
-                # Ensure all records have id field
-                for i, student in enumerate(self.students):
-                    if 'id' not in student:
-                        student['id'] = i + 1
-
-    def save_to_excel(self):
-        """Save current students to Excel file"""
-        if self.students:
-            df = pd.DataFrame(self.students)
-            df.to_excel(self.excel_file, index=False)
-
-    def add_student(self, data):
-        data['id'] = self.next_id
-        self.students.append(data)
-        self.next_id += 1
-        self.save_to_excel()  # Save to Excel after adding
-
-    def all_students(self):
-        return self.students
-
-    def get_student(self, sid):
-        return next((s for s in self.students if s['id'] == sid), None)
-
-    def update_student(self, sid, data):
-        for s in self.students:
-            if s['id'] == sid:
-                s.update(data)
-                break  # Break after updating the student
-        self.save_to_excel()  # Save to Excel after updating
-
-    def delete_student(self, sid):
-        self.students = [s for s in self.students if s['id'] != sid]
-        self.save_to_excel()  # Save to Excel after deleting
-
-# Initialize with Excel file
-student_manager = StudentManager(EXCEL_FILE)
+# ----------------- RESET TOKENS -----------------
+reset_tokens = make_token_store(TOKEN_STORE, TOKEN_DB, ttl=RESET_TOKEN_TTL, capacity=MAX_RESET_TOKENS)
+jobs.every(TOKEN_SWEEP_INTERVAL, "sweep_tokens", reset_tokens.sweep, name="sweep_tokens")
+atexit.register(reset_tokens.close)
 
 # ----------------- UTILITIES -----------------
-def extract_interests(txt):
-    if not txt:
-        return []
-    
-    # Convert to string in case it's a float or other type
-    txt = str(txt) if txt is not None else ""
-    
-    return [i.strip().title() for i in re.split(r'[,;|/\n]', txt) if len(i.strip()) > 2]
+def student_from(source):
+    """Student fields from a form or an imported row, as stripped strings"""
+    return {field: (source.get(field) or "").strip() for field in STUDENT_FIELDS}
 
-def generate_chart():
-    if not os.path.exists(EXCEL_FILE):
-        return None
-    
-    try:
-        df = pd.read_excel(EXCEL_FILE)
-        
-        # Check if the Excel file has data
-        if df.empty:
-            return None
-        
-        # Use 'interest' column instead of 'Area of Interest'
-        interests_column = 'interest'
-        
-        if interests_column not in df.columns:
-            # If 'interest' column doesn't exist, try to find a similar column
-            possible_columns = ['interest', 'Area of Interest', 'area_of_interest', 'interests']
-            for col in possible_columns:
-                if col in df.columns:
-                    interests_column = col
-                    break
-            else:
-                # No interest column found
-                return None
-        
-        interests = []
-        for t in df[interests_column].dropna():
-            # Ensure we're passing a string to extract_interests
-            interests.extend(extract_interests(str(t) if t is not None else ""))
-        
-        if not interests:
-            return None
-        
-        top = Counter(interests).most_common(10)
-        plt.figure(figsize=(8,5))
-        names, counts = zip(*top)
-        bars = plt.bar(names, counts, color=plt.cm.Set3(range(len(names))), edgecolor='black')
-        plt.xticks(rotation=45, ha='right')
-        for bar, count in zip(bars, counts):
-            plt.text(bar.get_x()+bar.get_width()/2, bar.get_height()+0.1, str(count), ha='center', va='bottom')
-        img = io.BytesIO()
-        plt.savefig(img, format='png', bbox_inches='tight')
-        img.seek(0)
-        plt.close()
-        return f"data:image/png;base64,{base64.b64encode(img.getvalue()).decode()}"
-    
-    except Exception as e:
-        print(f"Error generating chart: {e}")
-        return None
+def missing_fields(student):
+    return [field for field in REQUIRED_FIELDS if not student[field]]
+
+# ----------------- STUDENT MANAGEMENT -----------------
+student_manager = StudentManager(EXCEL_FILE, make_storage(EXCEL_FILE, STORAGE_BACKEND, jobs=jobs,
+                                                          export_interval=EXPORT_INTERVAL),
+                                 columnar=COLUMNAR_STORE)
+atexit.register(student_manager.storage.close)
+# Registered last so it runs first: queued work finishes before the storages close
+atexit.register(jobs.close)
+
+dashboard_stats = DashboardStats(extract_interests, StudentManager._index_key)
+student_manager.subscribe(dashboard_stats.on_student_change)
+user_store.subscribe(dashboard_stats.on_user_change)
+
+search_index = SearchIndex()
+student_manager.subscribe(search_index.on_student_change)
+
+@timed("chart_render")
+def render_chart(top):
+    """Render the top interests as a PNG bar chart"""
+    # Imported on first use, it is the slowest part of starting a worker
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    plt.figure(figsize=(8,5))
+    names, counts = zip(*top)
+    bars = plt.bar(names, counts, color=plt.cm.Set3(range(len(names))), edgecolor='black')
+    plt.xticks(rotation=45, ha='right')
+    for bar, count in zip(bars, counts):
+        plt.text(bar.get_x()+bar.get_width()/2, bar.get_height()+0.1, str(count), ha='center', va='bottom')
+    img = io.BytesIO()
+    plt.savefig(img, format='png', bbox_inches='tight')
+    plt.close()
+    return img.getvalue()
+
+class ChartCache:
+    """Interest chart PNG, re-rendered in the background when the top 10 interests change.
+
+    The last good image is served until the new one is ready; only the very
+    first render is waited for, as there is nothing to fall back on.
+    """
+    def __init__(self, manager, jobs, first_render_timeout=10):
+        self.manager = manager
+        self.jobs = jobs
+        self.first_render_timeout = first_render_timeout
+        self.version = None
+        # Top interests of the latest render requested
+        self.top = None
+        self.png = None
+        self.etag = None
+        self.on_rendered = None
+        self._job = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return (png, etag) for the current data, or (None, None) when there is nothing to chart"""
+        self.manager.refresh()
+        stale = False
+        with self._lock:
+            if self.version != self.manager.data_version:
+                top = self.manager.top_interests(10)
+                if top != self.top:
+                    self.top, stale = top, True
+                self.version = self.manager.data_version
+        if stale:
+            # Outside the lock: submit() runs the job inline once the queue is closed or full,
+            # and _render takes the lock
+            job = self.jobs.submit("chart", self._render, top, name="render_chart")
+            with self._lock:
+                if self.top is top:
+                    self._job = job
+        with self._lock:
+            job = self._job if self.png is None else None
+        if job is not None:
+            job.wait(self.first_render_timeout)
+        with self._lock:
+            return self.png, self.etag
+
+    def _render(self, top):
+        png = render_chart(top) if top else None
+        with self._lock:
+            self.png = png
+            self.etag = hashlib.md5(png).hexdigest() if png else None
+        if self.on_rendered is not None:
+            self.on_rendered()
+
+chart_cache = ChartCache(student_manager, jobs)
+student_analytics = analytics.Analytics(student_manager)
+
+class PageCache:
+    """Rendered pages keyed by (endpoint, query args, user, data version).
+
+    Served with an ETag and Last-Modified taken from the storage state, so
+    a browser revalidating an unchanged page gets a 304 without a render,
+    whichever worker it reaches. validators are functions whose results also
+    go into the ETag, for anything else a page embeds (asset URLs, the chart
+    URL). Entries are dropped on every data change and the least recently
+    used go first once the size limits are reached.
+    """
+    def __init__(self, manager, max_entries=256, max_bytes=32 * 1024 * 1024, validators=()):
+        self.manager = manager
+        self.validators = list(validators)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._pages = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        manager.subscribe(self.invalidate)
+
+    def invalidate(self, *event):
+        with self._lock:
+            self._pages.clear()
+            self._bytes = 0
+
+    def respond(self, render):
+        """Response for the current request, calling render() only when nothing cached fits"""
+        if session.get("_flashes"):
+            # Flash messages are shown once, so this page is not reusable
+            return render()
+        version, tag, modified = self.manager.version()
+        key = (request.endpoint, tuple(sorted(request.args.items(multi=True))),
+               session.get("user"), session.get("user_name"))
+        etag = self._etag(key, tag)
+        headers = {"Cache-Control": "private, no-cache", "Vary": "Cookie"}
+        if etag in request.if_none_match or (not request.if_none_match and modified and
+                request.if_modified_since and request.if_modified_since.timestamp() >= modified // 10**9):
+            response = Response(status=304, headers=headers)
+        else:
+            with self._lock:
+                body = self._pages.get(key + (version,))
+                if body is not None:
+                    self._pages.move_to_end(key + (version,))
+            if body is None:
+                body = render()
+                self._store(key + (version,), body)
+                # Rendering may have produced the first chart, which the ETag has to match
+                etag = self._etag(key, tag)
+            response = Response(body, headers=headers)
+        response.set_etag(etag)
+        if modified:
+            response.last_modified = modified / 1e9
+        return response
+
+    def _etag(self, key, tag):
+        return hashlib.md5(repr(key + (tag,) + tuple(v() for v in self.validators)).encode()).hexdigest()
+
+    def _store(self, key, body):
+        with self._lock:
+            if key in self._pages or len(body) > self.max_bytes:
+                return
+            self._pages[key] = body
+            self._bytes += len(body)
+            while len(self._pages) > self.max_entries or self._bytes > self.max_bytes:
+                self._bytes -= len(self._pages.popitem(last=False)[1])
+
+page_cache = PageCache(student_manager)
+# Pages embed the chart URL, which changes when a background render lands
+chart_cache.on_rendered = page_cache.invalidate
+
+# ----------------- STATIC ASSETS -----------------
+assets = Assets(app.static_folder)
+assets.init_app(app)
+
+def templates_fingerprint():
+    """Digest of every template's source"""
+    digest = hashlib.md5()
+    for name in sorted(app.jinja_loader.list_templates()):
+        digest.update(name.encode() + b"\0" + app.jinja_loader.get_source(app.jinja_env, name)[0].encode())
+    return digest.hexdigest()
+
+TEMPLATES_FINGERPRINT = templates_fingerprint()
+# A restart with new templates or styles, or a chart that finished rendering, changes the page
+page_cache.validators += [lambda: TEMPLATES_FINGERPRINT, lambda: assets.fingerprint, lambda: chart_cache.etag]
+
+# ----------------- METRICS -----------------
+metrics.init_app(app)
+metrics.registry.gauge("interns_students", lambda: dashboard_stats.total)
+metrics.registry.gauge("interns_registered_users", lambda: sum(dashboard_stats.registrations_by_day.values()))
+metrics.registry.gauge("interns_page_cache_entries", lambda: len(page_cache._pages))
+metrics.registry.gauge("interns_data_version", lambda: student_manager.data_version)
+metrics.registry.gauge("interns_jobs_queued", lambda: len(jobs))
+metrics.registry.gauge("interns_reset_tokens", lambda: len(reset_tokens))
 
 # ----------------- ROUTES -----------------
 
@@ -259,20 +278,12 @@ def login():
         username = request.form.get("username")
         password = request.form.get("password")
         
-        # First check in-memory users
-        user = next((u for u in users_db if (u['username']==username or u['email']==username) and u['password']==password), None)
-        
-        # If not found in memory, check Excel file
-        if not user:
-            user = authenticate_from_excel(username, password)
-            # If found in Excel, add to in-memory storage
-            if user and user not in users_db:
-                users_db.append(user)
-        
-        # Check default users
-        if not user and username in users and users[username]["password"] == password:
-            user = users[username]
-            
+        # Registered users first, then the built-in accounts
+        try:
+            user = user_store.authenticate(username, password)
+        except LoginsBusy:
+            log_event("login_busy")
+            return render_template("login.html", error="Too many logins, please try again"), 503, {"Retry-After": "1"}
         if user:
             session["user"] = user.get('username', username)
             session["user_name"] = user.get('name', user.get('fullname', 'User'))
@@ -298,11 +309,10 @@ def register():
         if not email: errors.append("Email required")
         if not password: errors.append("Password required")
 
-        # Check if user already exists in both memory and Excel
-        if any(u['username'] == username for u in users_db) or check_existing_user(username, email):
+        if username and user_store.get_by_username(username):
             errors.append("Username already exists")
         
-        if any(u['email'] == email for u in users_db) or check_existing_user(username, email):
+        if email and user_store.get_by_email(email):
             errors.append("Email already registered")
 
         if errors:
@@ -318,11 +328,7 @@ def register():
             "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
 
-        # Save to Excel file
-        if save_user_to_excel(user_data):
-            # Also add to in-memory storage for immediate access
-            users_db.append(user_data)
-            users[email] = {"username": username, "password": password, "name": fullname}
+        if user_store.add_user(user_data):
             flash("Registration successful! Please log in.", "success")
             return redirect(url_for("login"))
         else:
@@ -338,10 +344,16 @@ def forgot_password():
 
     if request.method == "POST":
         email = request.form.get("email", "").strip().lower()
-        if email in users or any(u['email']==email for u in users_db):
-            token = secrets.token_urlsafe(32)
-            reset_tokens[token] = {"email": email, "timestamp": datetime.now()}
-            print(f"Password reset link: http://localhost:5000/reset-password/{token}")
+        if reset_tokens.hit(f"reset:{email}", 3600) > RESET_RATE_LIMIT:
+            log_event("password_reset_limited")
+            return render_template("forgot_password.html",
+                                   error="Too many reset requests, please try again later"), 429
+        if user_store.get_by_email(email):
+            token = reset_tokens.issue({"email": email})
+            log_event("password_reset_requested")
+            if app.debug:
+                # The link is a credential, only show it on a development console
+                print(f"Password reset link: {url_for('reset_password', token=token, _external=True)}")
             flash("Password reset link sent to your email (check console in dev mode).", "success")
             return redirect(url_for("login"))
         return render_template("forgot_password.html", error="Email not found")
@@ -349,17 +361,10 @@ def forgot_password():
 
 @app.route("/reset-password/<token>", methods=["GET","POST"])
 def reset_password(token):
-    if token not in reset_tokens:
+    # Expired tokens read as missing, the sweeper deletes them later
+    if reset_tokens.get(token) is None:
         return render_template("reset_password.html", error="Invalid or expired token")
     
-    token_data = reset_tokens[token]
-    # Check if token is expired (24 hours)
-    if datetime.now() - token_data["timestamp"] > timedelta(hours=24):
-        del reset_tokens[token]
-        return render_template("reset_password.html", error="Token has expired")
-    
-    email = token_data['email']
-    
     if request.method == "POST":
         new_password = request.form.get("new_password")
         confirm_password = request.form.get("confirm_password")
@@ -367,16 +372,14 @@ def reset_password(token):
         if new_password != confirm_password:
             return render_template("reset_password.html", token=token, error="Passwords do not match")
         
-        # Update password in both users dict and users_db
-        if email in users:
-            users[email]['password'] = new_password
+        # Consuming is atomic, so a token can reset a password only once even across workers
+        token_data = reset_tokens.consume(token)
+        if token_data is None:
+            return render_template("reset_password.html", error="Invalid or expired token")
+        email = token_data['email']
+        # Updates a built-in account too
+        user_store.set_password(email, new_password)
         
-        for user in users_db:
-            if user['email'] == email:
-                user['password'] = new_password
-                break
-        
-        del reset_tokens[token]
         flash("Password reset successful. Please login.", "success")
         return redirect(url_for("login"))
     
@@ -386,23 +389,15 @@ def reset_password(token):
 def home():
     if "user" not in session:
         return redirect(url_for("login"))
-    
-    students = student_manager.all_students()
-    all_interests = []
-    for s in students: 
-        # Fix: Convert interest value to string before processing
-        interest_value = s.get("interest", "")
-        if interest_value is None:
-            interest_value = ""
-        else:
-            interest_value = str(interest_value)  # Convert to string
-        all_interests.extend(extract_interests(interest_value))
-    
-    chart_image = generate_chart()
+    return page_cache.respond(render_home)
+
+def render_home():
+    png, etag = chart_cache.get()
+    chart_image = url_for("chart_image", v=etag) if png else None
     
     # Prepare students data for template (ensure it's properly formatted)
     students_for_template = []
-    for student in students[:5]:
+    for student in student_manager.first_students(5):
         students_for_template.append({
             'id': student.get('id'),
             'name': student.get('name', ''),
@@ -412,23 +407,130 @@ def home():
             'branch': student.get('branch', ''),
             'year': student.get('year', ''),
             'skills': student.get('skills', ''),
-            'interest': str(student.get('interest', ''))  # Convert to string here too
+            'interest': str(student.get('interest') or '')  # Convert to string here too
         })
     
     return render_template("home.html", 
                          user=session.get("user_name", "User"),
                          students=students_for_template, 
                          chart=chart_image, 
-                         total_students=len(students),
-                         unique_interests=len(set(all_interests)))
+                         total_students=dashboard_stats.total,
+                         unique_interests=dashboard_stats.unique_interests)
+
+@app.route("/api/stats")
+def stats():
+    if "user" not in session:
+        return jsonify({"error": "login required"}), 401
+    student_manager.refresh()
+    user_store.refresh()
+    return jsonify(dashboard_stats.as_dict())
+
+@app.route("/api/analytics")
+def analytics_report():
+    """Interests by branch and year, skill co-occurrence and cohort growth"""
+    if "user" not in session:
+        return jsonify({"error": "login required"}), 401
+    report, version = student_analytics.report()
+    response = jsonify(report)
+    response.set_etag(f"{version[1]}-analytics")
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@app.route("/analytics/<name>.png")
+def analytics_chart(name):
+    if "user" not in session:
+        return redirect(url_for("login"))
+    if name not in analytics.CHARTS:
+        abort(404)
+    png, version = student_analytics.chart(name)
+    response = Response(png, mimetype="image/png")
+    response.set_etag(f"{version[1]}-{name}")
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@app.route("/search")
+def search():
+    if "user" not in session:
+        return jsonify({"error": "login required"}), 401
+    q = request.args.get("q", "").strip()
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = min(max(request.args.get("per_page", PER_PAGE, type=int), 1), MAX_PER_PAGE)
+    fuzzy = request.args.get("fuzzy", "1") != "0"
+    started = time.perf_counter()
+    student_manager.refresh()
+    hits, total = search_index.search(q, page, per_page, fuzzy) if q else ([], 0)
+    results = []
+    for sid, score in hits:
+        student = student_manager.get_student(sid)
+        if student:
+            results.append(dict(student, score=round(score, 3)))
+    return jsonify({
+        "q": q,
+        "results": results,
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2),
+    })
+
+@app.route("/jobs")
+def job_status():
+    if "user" not in session:
+        return jsonify({"error": "login required"}), 401
+    return jsonify(jobs.status())
+
+@app.route("/chart.png")
+def chart_image():
+    if "user" not in session:
+        return redirect(url_for("login"))
+    png, etag = chart_cache.get()
+    if png is None:
+        abort(404)
+    response = Response(png, mimetype="image/png")
+    response.set_etag(etag)
+    # The URL carries the ETag, but revalidate anyway in case it is requested bare
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @app.route("/interns")
 def interns():
     if "user" not in session: 
         return redirect(url_for("login"))
-    return render_template("interns.html", 
-                         students=student_manager.all_students(), 
-                         user=session.get("user_name"))
+    if request.args.get("format") == "json" or \
+            request.accept_mimetypes.best_match(["text/html", "application/json"]) == "application/json":
+        return jsonify(list_students(request.args))
+    return page_cache.respond(lambda: render_template("interns.html",
+                                                      user=session.get("user_name"),
+                                                      **list_students(request.args)))
+
+def list_students(args):
+    """One page of students for the /interns listing, filtered and sorted from query args"""
+    filters = {f: args.get(f, "").strip() for f in ("branch", "year", "interest")}
+    q = args.get("q", "").strip()
+    sort = args.get("sort", "id")
+    if sort not in StudentManager.SORT_FIELDS:
+        sort = "id"
+    order = "desc" if args.get("order") == "desc" else "asc"
+    per_page = min(max(args.get("per_page", PER_PAGE, type=int), 1), MAX_PER_PAGE)
+    matches = student_manager.find(q=q, sort=sort, descending=order == "desc", **filters)
+    total = len(matches)
+    pages = max((total + per_page - 1) // per_page, 1)
+    page = min(max(args.get("page", 1, type=int), 1), pages)
+    start = (page - 1) * per_page
+    return {
+        "students": matches[start:start + per_page],
+        "total": total,
+        "page": page,
+        "pages": pages,
+        "per_page": per_page,
+        "sort": sort,
+        "order": order,
+        "q": q,
+        "filters": filters,
+    }
 
 
 # Add this custom filter to your Flask app
@@ -446,24 +548,14 @@ def new_entry():
         return redirect(url_for("login"))
     
     if request.method == "POST":
-        student = {
-            "name": request.form.get("name","").strip(),
-            "email": request.form.get("email","").strip(),
-            "phone": request.form.get("phone","").strip(),
-            "education": request.form.get("education","").strip(),
-            "branch": request.form.get("branch","").strip(),
-            "year": request.form.get("year","").strip(),
-            "skills": request.form.get("skills","").strip(),
-            "interest": request.form.get("interest","").strip()
-        }
+        student = student_from(request.form)
         
         # Check required fields
-        required_fields = ["name", "email", "phone", "education", "branch", "year"]
-        missing_fields = [field for field in required_fields if not student[field]]
+        missing = missing_fields(student)
         
-        if missing_fields:
+        if missing:
             return render_template("new_entry.html", 
-                                 error=f"Missing required fields: {', '.join(missing_fields)}")
+                                 error=f"Missing required fields: {', '.join(missing)}")
         
         # Add student to manager (this now automatically saves to Excel)
         student_manager.add_student(student)
@@ -473,6 +565,62 @@ def new_entry():
     
     return render_template("new_entry.html")
 
+@app.route("/interns/import", methods=["POST"])
+def import_students():
+    if "user" not in session:
+        return redirect(url_for("login"))
+    
+    upload = request.files.get("file")
+    if not upload or not upload.filename:
+        flash("Choose a CSV or Excel file to import.", "error")
+        return redirect(url_for("interns"))
+    
+    students, errors = [], []
+    try:
+        rows = iter_upload_rows(upload.filename, upload.stream)
+        # Validate as we parse so a bad file fails before anything is added
+        for chunk_no, chunk in enumerate(chunked(rows, IMPORT_CHUNK_SIZE)):
+            for i, row in enumerate(chunk):
+                student = student_from(row)
+                missing = missing_fields(student)
+                if missing:
+                    # +2 for the header row and 1-based numbering
+                    errors.append(f"Row {chunk_no * IMPORT_CHUNK_SIZE + i + 2}: missing {', '.join(missing)}")
+                else:
+                    students.append(student)
+    except Exception as e:
+        flash(f"Could not read {upload.filename}: {e}", "error")
+        return redirect(url_for("interns"))
+    
+    if errors:
+        for e in errors[:10]: flash(e, "error")
+        if len(errors) > 10:
+            flash(f"...and {len(errors) - 10} more rows with errors. Nothing was imported.", "error")
+        else:
+            flash("Nothing was imported.", "error")
+        return redirect(url_for("interns"))
+    
+    student_manager.add_students(students)
+    flash(f"Imported {len(students)} students.", "success")
+    return redirect(url_for("interns"))
+
+@app.route("/interns/export.<fmt>")
+def export_students(fmt):
+    if "user" not in session:
+        return redirect(url_for("login"))
+    
+    fields = ["id"] + STUDENT_FIELDS
+    students = student_manager.all_students()
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    if fmt == "csv":
+        body, mimetype = stream_csv(students, fields), "text/csv"
+    elif fmt == "xlsx":
+        body, mimetype = stream_xlsx(students, fields), "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    else:
+        abort(404)
+    return Response(body, mimetype=mimetype,
+                    headers={"Content-Disposition": f"attachment; filename=interns-{stamp}.{fmt}"})
+
 # Change this route definition
 @app.route("/edit/<int:student_id>", methods=["GET","POST"])
 def edit_student(student_id):
@@ -485,24 +633,14 @@ def edit_student(student_id):
         return redirect(url_for("interns"))
     
     if request.method == "POST":
-        updated_data = {
-            "name": request.form.get("name","").strip(),
-            "email": request.form.get("email","").strip(),
-            "phone": request.form.get("phone","").strip(),
-            "education": request.form.get("education","").strip(),
-            "branch": request.form.get("branch","").strip(),
-            "year": request.form.get("year","").strip(),
-            "skills": request.form.get("skills","").strip(),
-            "interest": request.form.get("interest","").strip()
-        }
+        updated_data = student_from(request.form)
         
-        required_fields = ["name", "email", "phone", "education", "branch", "year"]
-        missing_fields = [field for field in required_fields if not updated_data[field]]
+        missing = missing_fields(updated_data)
         
-        if missing_fields:
+        if missing:
             return render_template("edit_student.html", 
                                  student=student,
-                                 error=f"Missing required fields: {', '.join(missing_fields)}")
+                                 error=f"Missing required fields: {', '.join(missing)}")
         
         student_manager.update_student(student_id, updated_data)
         flash("Student updated successfully!", "success")
@@ -529,6 +667,10 @@ def logout():
     session.clear()
     return redirect(url_for("login"))
 
+# ----------------- JSON API -----------------
+app.register_blueprint(create_api(student_manager, list_students, STUDENT_FIELDS, REQUIRED_FIELDS),
+                       url_prefix="/api/v1")
+
 # ----------------- ERROR HANDLERS -----------------
 @app.errorhandler(404)
 def page_not_found(e):
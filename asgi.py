@@ -0,0 +1,14 @@
+"""ASGI entry point. The server's event loop does the socket I/O, and each
+request runs on its own thread from a pool of INTERNS_ASGI_THREADS, so one
+slow request ties up only its own thread:
+
+    pip install uvicorn a2wsgi
+    uvicorn asgi:app --workers 4
+"""
+import os
+from a2wsgi import WSGIMiddleware
+from apps import app as wsgi_app
+
+THREADS = int(os.environ.get("INTERNS_ASGI_THREADS", "16"))
+
+app = WSGIMiddleware(wsgi_app, workers=THREADS)
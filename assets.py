@@ -0,0 +1,222 @@
+import gzip, hashlib, io, json, mimetypes, os, re, threading, time
+from flask import abort, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Stylesheets and scripts under static/ that templates link to through asset_url()
+BUNDLE_DIRS = ("css", "js")
+COMPRESSIBLE = (".css", ".js", ".svg", ".json")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+# Widths generated for each image, besides its own
+IMAGE_WIDTHS = (320, 640, 1280)
+IMAGE_OPTIONS = {
+    "WEBP": {"quality": 80, "method": 6},
+    "JPEG": {"quality": 82, "optimize": True, "progressive": True},
+    "PNG": {"optimize": True},
+}
+# Fingerprinted files never change, so browsers may keep them for a year
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Outputs no longer in the manifest are deleted after this long, pages cached elsewhere may still link them
+STALE_SECONDS = 24 * 3600
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _slug(name):
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", name)
+
+
+class Assets:
+    """Fingerprinted, precompressed copies of static/css, static/js and resized static images.
+
+    build() writes them to static/dist as name.<hash>.ext (plus .gz and .br
+    when those are smaller) and records the names in manifest.json. They are
+    served from /assets with an immutable Cache-Control header; a changed
+    file gets a new name, so there is nothing to invalidate.
+    """
+    def __init__(self, static_folder, out_dir=None):
+        self.static_folder = static_folder
+        self.out_dir = out_dir or os.path.join(static_folder, "dist")
+        self.manifest = {}
+        # Changes whenever any output name does, for caches of pages that link them
+        self.fingerprint = None
+        self._images = {}
+        self._sources = None
+        self._lock = threading.Lock()
+
+    # ----- building -----
+    def _scan(self):
+        """{logical name: mtime_ns} of every source file"""
+        sources = {}
+        for folder in BUNDLE_DIRS:
+            root = os.path.join(self.static_folder, folder)
+            for dirpath, _, files in os.walk(root):
+                for f in files:
+                    path = os.path.join(dirpath, f)
+                    sources[os.path.relpath(path, self.static_folder).replace(os.sep, "/")] = os.stat(path).st_mtime_ns
+        for f in os.listdir(self.static_folder):
+            path = os.path.join(self.static_folder, f)
+            if os.path.isfile(path) and f.lower().endswith(IMAGE_EXTENSIONS):
+                sources[f] = os.stat(path).st_mtime_ns
+        return sources
+
+    def _write(self, name, data):
+        """Store data as dist/name (if not there yet) with its compressed twins"""
+        path = os.path.join(self.out_dir, name)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        outputs = [(path, data)]
+        if name.endswith(COMPRESSIBLE):
+            gz = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(gz) < len(data):
+                outputs.append((path + ".gz", gz))
+            if brotli is not None:
+                br = brotli.compress(data, quality=11)
+                if len(br) < len(data):
+                    outputs.append((path + ".br", br))
+        # Uncompressed last, its presence marks the set complete
+        for target, content in reversed(outputs):
+            tmp = f"{target}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(content)
+            os.replace(tmp, target)
+
+    def _bundle(self, name):
+        with open(os.path.join(self.static_folder, name), "rb") as f:
+            data = f.read()
+        stem, ext = os.path.splitext(name)
+        out = f"{stem}.{_digest(data)}{ext}"
+        self._write(out, data)
+        return out
+
+    def _variants(self, name):
+        """{width: {format: dist name}} for one image, and the format its plain name should get"""
+        path = os.path.join(self.static_folder, name)
+        with open(path, "rb") as f:
+            digest = _digest(f.read())
+        stem = _slug(os.path.splitext(name)[0])
+        # Opening only reads the header, pixels are decoded when a missing variant needs them
+        with Image.open(path) as im:
+            alpha = im.mode in ("RGBA", "LA", "P")
+            fallback = ("PNG", "png") if alpha else ("JPEG", "jpg")
+            # Keep serving WebP sources as WebP, anything else in the format every browser shows
+            own = "webp" if im.format == "WEBP" else fallback[1]
+            widths = sorted({w for w in IMAGE_WIDTHS if w < im.width} | {im.width})
+            variants = {}
+            for width in widths:
+                variants[width] = {}
+                for fmt, ext in (("WEBP", "webp"), fallback):
+                    out = f"img/{stem}.{width}w.{digest}.{ext}"
+                    variants[width][ext] = out
+                    if os.path.exists(os.path.join(self.out_dir, out)):
+                        continue
+                    resized = im if width == im.width else im.resize(
+                        (width, round(im.height * width / im.width)), Image.LANCZOS)
+                    if fmt == "JPEG" and resized.mode != "RGB":
+                        resized = resized.convert("RGB")
+                    buf = io.BytesIO()
+                    resized.save(buf, fmt, **IMAGE_OPTIONS[fmt])
+                    self._write(out, buf.getvalue())
+        return variants, own
+
+    def build(self):
+        """Fingerprint every source and write the manifest, reusing outputs that already exist"""
+        with self._lock:
+            sources = self._scan()
+            manifest, images = {}, {}
+            for name in sorted(sources):
+                if name.lower().endswith(IMAGE_EXTENSIONS) and "/" not in name:
+                    if Image is None:
+                        continue
+                    images[name], own = self._variants(name)
+                    manifest[name] = images[name][max(images[name])][own]
+                else:
+                    manifest[name] = self._bundle(name)
+            self.manifest, self._images, self._sources = manifest, images, sources
+            data = json.dumps({"files": manifest, "images": images}, indent=1, sort_keys=True)
+            self.fingerprint = _digest(data.encode())
+            tmp = os.path.join(self.out_dir, f"manifest.json.{os.getpid()}.tmp")
+            os.makedirs(self.out_dir, exist_ok=True)
+            with open(tmp, "w") as f:
+                f.write(data)
+            os.replace(tmp, os.path.join(self.out_dir, "manifest.json"))
+            self._prune()
+
+    def _prune(self):
+        live = set(self.manifest.values())
+        live.update(out for variants in self._images.values() for formats in variants.values() for out in formats.values())
+        cutoff = time.time() - STALE_SECONDS
+        for dirpath, _, files in os.walk(self.out_dir):
+            for f in files:
+                path = os.path.join(dirpath, f)
+                name = os.path.relpath(path, self.out_dir).replace(os.sep, "/")
+                base = re.sub(r"\.(gz|br)$", "", name)
+                if base != "manifest.json" and base not in live and os.stat(path).st_mtime < cutoff:
+                    os.remove(path)
+
+    def refresh(self):
+        """Rebuild if a source was added, removed or edited since the last build"""
+        if self._scan() != self._sources:
+            self.build()
+
+    # ----- template helpers -----
+    def url(self, name, width=None, fmt=None):
+        """URL of the fingerprinted name (or of an image variant), falling back to the plain static file"""
+        if width or fmt:
+            variants = self._images.get(name)
+            if variants:
+                w = min((w for w in variants if w >= (width or 0)), default=max(variants))
+                formats = variants[w]
+                return url_for("assets", filename=formats.get(fmt) or next(iter(formats.values())))
+        out = self.manifest.get(name)
+        if out is None:
+            return url_for("static", filename=name)
+        return url_for("assets", filename=out)
+
+    def srcset(self, name, fmt="webp"):
+        """A srcset listing every width of an image, for <img srcset> or <source srcset>"""
+        variants = self._images.get(name, {})
+        return ", ".join(f"{url_for('assets', filename=formats[fmt])} {w}w"
+                         for w, formats in sorted(variants.items()) if fmt in formats)
+
+    # ----- serving -----
+    def serve(self, filename):
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        accepted = request.accept_encodings
+        response = None
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if accepted[encoding] and os.path.isfile(os.path.join(self.out_dir, filename + suffix)):
+                response = send_from_directory(self.out_dir, filename + suffix, mimetype=mimetype)
+                response.headers["Content-Encoding"] = encoding
+                break
+        if response is None:
+            if filename == "manifest.json" or filename.endswith((".gz", ".br", ".tmp")):
+                abort(404)
+            response = send_from_directory(self.out_dir, filename, mimetype=mimetype)
+        if filename.endswith(COMPRESSIBLE):
+            response.vary.add("Accept-Encoding")
+        response.headers["Cache-Control"] = CACHE_CONTROL
+        return response
+
+    def init_app(self, app):
+        """Build, serve /assets and give templates asset_url() and image_srcset()"""
+        self.build()
+        app.add_url_rule("/assets/<path:filename>", "assets", self.serve)
+        app.jinja_env.globals.update(asset_url=self.url, image_srcset=self.srcset)
+
+        @app.before_request
+        def rebuild_assets():
+            # Edits to static files show up without a restart while developing
+            if app.debug:
+                self.refresh()
@@ -0,0 +1,93 @@
+import csv, io, os, tempfile
+from itertools import islice
+
+# Spreadsheet headers that mean one of our fields
+HEADER_ALIASES = {"area_of_interest": "interest", "interests": "interest", "full_name": "name"}
+
+
+def normalize_header(header):
+    key = str(header or "").strip().lower().replace(" ", "_")
+    return HEADER_ALIASES.get(key, key)
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        # Phone numbers typed into Excel come back as floats
+        value = int(value)
+    return str(value).strip()
+
+
+def iter_csv_rows(stream):
+    """Yield one dict per CSV row, keyed by normalized header"""
+    reader = csv.reader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    headers = [normalize_header(h) for h in next(reader, [])]
+    for row in reader:
+        if any(cell.strip() for cell in row):
+            yield dict(zip(headers, (_cell(c) for c in row)))
+
+
+def iter_xlsx_rows(stream):
+    """Yield one dict per row of the first sheet without loading the whole workbook"""
+    from openpyxl import load_workbook
+    wb = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        headers = [normalize_header(h) for h in next(rows, ())]
+        for row in rows:
+            if any(c is not None and str(c).strip() for c in row):
+                yield dict(zip(headers, (_cell(c) for c in row)))
+    finally:
+        wb.close()
+
+
+def iter_upload_rows(filename, stream):
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext == ".csv":
+        return iter_csv_rows(stream)
+    if ext in (".xlsx", ".xlsm"):
+        return iter_xlsx_rows(stream)
+    raise ValueError("Upload a .csv or .xlsx file")
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def stream_csv(students, fields):
+    """Generate a CSV document row by row"""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(fields)
+    for student in students:
+        writer.writerow([_cell(student.get(f)) for f in fields])
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    yield buf.getvalue()
+
+
+def stream_xlsx(students, fields, chunk_size=64 * 1024):
+    """Generate an .xlsx document.
+
+    Rows go straight to a temporary file through openpyxl's write-only mode,
+    so memory stays flat, and the finished file is sent in chunks.
+    """
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("interns")
+    ws.append(list(fields))
+    for student in students:
+        ws.append([student.get(f) for f in fields])
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        wb.save(path)
+        with open(path, "rb") as f:
+            while data := f.read(chunk_size):
+                yield data
+    finally:
+        os.remove(path)
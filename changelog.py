@@ -0,0 +1,137 @@
+import json, os, threading, time
+from collections import deque
+from itertools import islice
+from storage import _json_default
+
+
+def diff(old, new):
+    """{field: [old, new]} for every field whose value changed"""
+    return {f: [old.get(f), new.get(f)] for f in set(old) | set(new) if f != "id" and old.get(f) != new.get(f)}
+
+
+class ChangeLog:
+    """Sequenced add/update/delete events with field-level diffs, kept in a JSON-lines file.
+
+    Every worker process appends to the same file under the storage's
+    cross-process lock, so sequence numbers increase by one across all of
+    them, and each one tails the file to answer since() for consumers. Only
+    the last keep events are retained; asking for anything older returns
+    None and the consumer has to resync from the full listing. Without a
+    path the events are only kept in memory.
+    """
+    def __init__(self, path, keep=10000):
+        self.path = path
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._events = deque(maxlen=keep)
+        self._lines = 0
+        self._inode = None
+        self._offset = 0
+        self.last_seq = 0
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self):
+        """Read what other workers appended; needs self._lock"""
+        if self.path is None:
+            return
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if st.st_ino != self._inode or st.st_size < self._offset:
+            # Trimmed by another worker, start over
+            self._events.clear()
+            self._inode, self._offset, self._lines = st.st_ino, 0, 0
+        if st.st_size == self._offset:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        # A line still being written is read next time
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if line.strip():
+                event = json.loads(line)
+                self._events.append(event)
+                self.last_seq = max(self.last_seq, event["seq"])
+                self._lines += 1
+        self._offset += end
+
+    def append(self, events):
+        """Number and store events; call inside the storage transaction, after the change is committed"""
+        if not events:
+            return
+        with self._lock:
+            self._refresh()
+            now = round(time.time(), 3)
+            lines = []
+            for event in events:
+                self.last_seq += 1
+                event = dict(event, seq=self.last_seq, ts=now)
+                self._events.append(event)
+                lines.append(json.dumps(event, default=_json_default) + "\n")
+            if self.path is not None:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self._offset = f.tell()
+                    self._inode = os.fstat(f.fileno()).st_ino
+                self._lines += len(lines)
+                if self._lines > 2 * self.keep:
+                    self._trim()
+        with self._cond:
+            self._cond.notify_all()
+
+    def _trim(self):
+        """Rewrite the file with only the retained events; needs self._lock"""
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for event in self._events:
+                f.write(json.dumps(event, default=_json_default) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        os.replace(tmp, self.path)
+        self._inode, self._offset, self._lines = os.stat(self.path).st_ino, size, len(self._events)
+
+    def latest(self):
+        """Sequence number of the newest event"""
+        with self._lock:
+            self._refresh()
+            return self.last_seq
+
+    def first_seq(self):
+        """Oldest sequence number since() can still start after"""
+        with self._lock:
+            self._refresh()
+            return self._events[0]["seq"] - 1 if self._events else self.last_seq
+
+    def since(self, seq, limit=1000):
+        """Up to limit events after seq, or None if some of them are no longer retained"""
+        with self._lock:
+            self._refresh()
+            if seq >= self.last_seq:
+                return []
+            if not self._events or self._events[0]["seq"] > seq + 1:
+                return None
+            # Sequence numbers are consecutive, so the start is an offset from the oldest
+            start = seq + 1 - self._events[0]["seq"]
+            return list(islice(self._events, start, start + limit))
+
+    def wait(self, seq, timeout, limit=1000, poll=0.5):
+        """since(), but blocking up to timeout seconds for the first event after seq.
+
+        Appends in this process wake waiters at once; ones from other workers
+        are noticed within poll seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            events = self.since(seq, limit)
+            remaining = deadline - time.monotonic()
+            if events is None or events or remaining <= 0:
+                return events
+            with self._cond:
+                self._cond.wait(min(remaining, poll))
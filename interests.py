@@ -0,0 +1,90 @@
+import json, os, re
+from functools import lru_cache
+
+SEPARATORS = re.compile(r'[,;|/\n]')
+SPACES = re.compile(r'\s+')
+# Shorthand and spelling variants, keyed by lowercased token, that mean the
+# same interest. Aliases may be shorter than the usual 3 character minimum.
+DEFAULT_ALIASES = {
+    "ml": "Machine Learning",
+    "ai": "Artificial Intelligence",
+    "dl": "Deep Learning",
+    "ds": "Data Science",
+    "nlp": "Natural Language Processing",
+    "cv": "Computer Vision",
+    "iot": "Internet Of Things",
+    "ui": "UI/UX",
+    "ux": "UI/UX",
+    "web dev": "Web Development",
+    "webdev": "Web Development",
+    "app dev": "App Development",
+    "cybersecurity": "Cyber Security",
+    "cloud": "Cloud Computing",
+}
+# Extra aliases, a JSON object of {"variant": "Canonical Interest"}
+ALIASES_FILE = os.environ.get("INTERNS_INTEREST_ALIASES")
+CACHE_SIZE = 8192
+
+aliases = dict(DEFAULT_ALIASES)
+
+
+def set_aliases(mapping, replace=False):
+    """Add (or with replace, swap in) alias mappings and drop cached results"""
+    if replace:
+        aliases.clear()
+    aliases.update({SPACES.sub(" ", k).strip().lower(): v for k, v in mapping.items()})
+    _tokenize.cache_clear()
+
+
+def load_aliases(path):
+    with open(path, encoding="utf-8") as f:
+        set_aliases(json.load(f))
+
+
+def canonical_interest(token):
+    """Canonical name of one interest, or None if it is too short to mean anything"""
+    token = SPACES.sub(" ", str(token)).strip()
+    alias = aliases.get(token.lower())
+    if alias is not None:
+        return alias
+    return token.title() if len(token) > 2 else None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _tokenize(txt):
+    seen = []
+    for part in SEPARATORS.split(txt):
+        interest = canonical_interest(part)
+        if interest is not None and interest not in seen:
+            seen.append(interest)
+    return tuple(seen)
+
+
+def extract_interests(txt):
+    """Distinct canonical interests in a free-text value, in order of appearance"""
+    if not txt:
+        return ()
+    # Convert to string in case it's a float or other type
+    return _tokenize(str(txt))
+
+
+def interests_column(series):
+    """Canonical interests of a whole pandas column at once.
+
+    Returns one row per (original index, interest), so
+    interests_column(df['interest']).value_counts() counts students per
+    interest. Splitting, trimming and alias lookup use pandas string ops
+    instead of a Python call per cell.
+    """
+    tokens = series.dropna().astype(str).str.split(SEPARATORS).explode()
+    tokens = tokens.str.replace(SPACES, " ", regex=True).str.strip()
+    mapped = tokens.str.lower().map(aliases)
+    canonical = mapped.fillna(tokens.str.title())
+    canonical = canonical[mapped.notna() | (tokens.str.len() > 2)].rename("interest")
+    # Drop repeats within a cell, as extract_interests does
+    pairs = canonical.reset_index().drop_duplicates()
+    return pairs.set_index(pairs.columns[0])["interest"].rename_axis(series.index.name)
+
+
+if ALIASES_FILE:
+    load_aliases(ALIASES_FILE)
@@ -0,0 +1,192 @@
+import itertools, logging, threading, time
+from collections import deque
+from metrics import log_event, record_span
+
+
+class Job:
+    """One unit of background work and what became of it"""
+    _ids = itertools.count(1)
+
+    def __init__(self, key, fn, args, name=None):
+        self.id = next(self._ids)
+        self.key = key
+        self.name = name or getattr(fn, "__qualname__", "job")
+        self.fn, self.args = fn, args
+        self.status = "queued"
+        self.coalesced = 0
+        self.submitted = time.time()
+        self.started = self.finished = None
+        self.error = None
+        self.result = None
+        self._done = threading.Event()
+
+    def wait(self, timeout=None):
+        """Block until the job has run; False if the timeout expired first"""
+        return self._done.wait(timeout)
+
+    def run(self):
+        self.status, self.started = "running", time.time()
+        started = time.perf_counter()
+        try:
+            self.result = self.fn(*self.args)
+            self.status = "done"
+        except Exception as e:
+            self.status, self.error = "failed", f"{type(e).__name__}: {e}"
+            log_event("job_failed", logging.ERROR, job=self.name, key=str(self.key), error=self.error)
+        finally:
+            self.finished = time.time()
+            record_span(f"job:{self.name}", time.perf_counter() - started)
+            self._done.set()
+
+    def as_dict(self):
+        return {"id": self.id, "name": self.name, "key": str(self.key), "status": self.status,
+                "coalesced": self.coalesced, "submitted": self.submitted, "started": self.started,
+                "finished": self.finished, "error": self.error}
+
+
+class JobQueue:
+    """A few worker threads running slow work off the request path.
+
+    Jobs submitted with the same key coalesce: while one is still waiting,
+    later submissions only replace its arguments, so ten edits in a second
+    cause one workbook write. Jobs sharing a key never run concurrently; one
+    submitted while its twin runs waits for it and then runs once more, so
+    the newest state always gets written.
+
+    The queue is bounded. When it is full, submit() runs the job on the
+    caller's thread instead, which slows the producers down rather than
+    dropping work. After close() everything runs inline too.
+    """
+    def __init__(self, workers=2, max_depth=100, history=50):
+        self.workers = workers
+        self.max_depth = max_depth
+        self._cond = threading.Condition()
+        self._pending = deque()
+        self._queued = {}
+        self._running = {}
+        self._running_keys = set()
+        self._recent = deque(maxlen=history)
+        self._timers = {}
+        self._closed = False
+        self._threads = [threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                         for i in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, key, fn, *args, name=None):
+        """Run fn(*args) in the background and return its Job"""
+        with self._cond:
+            job = self._queued.get(key) if key is not None else None
+            if job is not None:
+                job.fn, job.args = fn, args
+                job.coalesced += 1
+                return job
+            job = Job(key, fn, args, name)
+            inline = self._closed or len(self._pending) >= self.max_depth
+            if not inline:
+                self._pending.append(job)
+                if key is not None:
+                    self._queued[key] = job
+                self._cond.notify()
+        if inline:
+            job.run()
+            with self._cond:
+                self._recent.append(job)
+        return job
+
+    def every(self, interval, key, fn, *args, name=None):
+        """Submit fn(*args) under key every interval seconds until cancel(key)"""
+        with self._cond:
+            self._timers[key] = (interval, fn, args, name, time.monotonic() + interval)
+            self._cond.notify()
+
+    def cancel(self, key):
+        """Stop a periodic job and drop its waiting run, if any"""
+        with self._cond:
+            self._timers.pop(key, None)
+            job = self._queued.pop(key, None)
+            if job is not None:
+                self._pending.remove(job)
+                job.status = "cancelled"
+                job._done.set()
+
+    def _fire_timers(self):
+        """Queue due periodic jobs, returning seconds until the next one (or None)"""
+        now = time.monotonic()
+        wait = None
+        for key, (interval, fn, args, name, due) in list(self._timers.items()):
+            if due <= now:
+                self._cond.release()
+                try:
+                    self.submit(key, fn, *args, name=name)
+                finally:
+                    self._cond.acquire()
+                if key in self._timers:
+                    due = now + interval
+                    self._timers[key] = (interval, fn, args, name, due)
+            wait = due - now if wait is None else min(wait, due - now)
+        return wait
+
+    def _next_job(self):
+        for job in self._pending:
+            if job.key is None or job.key not in self._running_keys:
+                self._pending.remove(job)
+                if job.key is not None:
+                    del self._queued[job.key]
+                    self._running_keys.add(job.key)
+                self._running[job.id] = job
+                return job
+        return None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed and not self._pending:
+                        return
+                    wait = None if self._closed else self._fire_timers()
+                    job = self._next_job()
+                    if job is not None:
+                        break
+                    self._cond.wait(wait)
+            job.run()
+            with self._cond:
+                del self._running[job.id]
+                self._running_keys.discard(job.key)
+                self._recent.append(job)
+                self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Wait until nothing is queued or running; False if the timeout expired first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout=30):
+        """Finish queued work, stop the workers and run anything submitted later inline"""
+        with self._cond:
+            self._closed = True
+            self._timers.clear()
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join(timeout)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def status(self):
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "max_depth": self.max_depth,
+                "closed": self._closed,
+                "queued": [job.as_dict() for job in self._pending],
+                "running": [job.as_dict() for job in self._running.values()],
+                "periodic": {str(key): timer[0] for key, timer in self._timers.items()},
+                "recent": [job.as_dict() for job in reversed(self._recent)],
+            }
@@ -0,0 +1,236 @@
+import json, logging, os, threading, time, traceback
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Requests slower than this are logged at WARNING
+SLOW_REQUEST_SECONDS = float(os.environ.get("INTERNS_SLOW_REQUEST_SECONDS", "1.0"))
+# "1" lets a request ask for a cProfile dump with ?_profile=1 or an X-Profile: 1 header
+PROFILING = os.environ.get("INTERNS_PROFILING") == "1"
+PROFILE_TOP = 25
+
+log = logging.getLogger("interns")
+
+
+def configure_log():
+    """JSON lines on stderr at INTERNS_LOG_LEVEL, unless the logger was set up elsewhere"""
+    if not log.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+        log.setLevel(os.environ.get("INTERNS_LOG_LEVEL", "INFO").upper())
+        log.propagate = False
+
+
+def log_event(event, level=logging.INFO, exc_info=False, **fields):
+    """One JSON object per line, easy to grep and to ship to a log pipeline.
+
+    With exc_info the exception being handled goes in a traceback field.
+    """
+    # Storage logs while the app is still starting, before init_app
+    configure_log()
+    if log.isEnabledFor(level):
+        if exc_info:
+            fields["traceback"] = traceback.format_exc()
+        log.log(level, json.dumps(dict(event=event, ts=round(time.time(), 3), **fields), default=str))
+
+
+class Registry:
+    """Counters, histograms and gauges rendered in the Prometheus text format"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._histograms = {}
+        self._gauges = {}
+        self._help = {}
+
+    def describe(self, name, text):
+        self._help[name] = text
+
+    def inc(self, name, amount=1, **labels):
+        with self._lock:
+            self._counters[name, tuple(sorted(labels.items()))] += amount
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [[0] * len(BUCKETS), 0, 0.0]
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    hist[0][i] += 1
+            hist[1] += 1
+            hist[2] += seconds
+
+    def gauge(self, name, read):
+        """Report read() as the value of name at every scrape"""
+        self._gauges[name] = read
+
+    @staticmethod
+    def _labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+        return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+    def render(self):
+        lines = []
+
+        def header(name, kind):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((k, (list(h[0]), h[1], h[2])) for k, h in self._histograms.items())
+        seen = set()
+        for (name, labels), value in counters:
+            if name not in seen:
+                seen.add(name)
+                header(name, "counter")
+            lines.append(f"{name}{self._labels(labels)} {value:g}")
+        for (name, labels), (buckets, count, total) in histograms:
+            if name not in seen:
+                seen.add(name)
+                header(name, "histogram")
+            for bound, n in zip(BUCKETS, buckets):
+                lines.append(f"{name}_bucket{self._labels(labels, [('le', f'{bound:g}')])} {n}")
+            lines.append(f"{name}_bucket{self._labels(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{self._labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{self._labels(labels)} {count}")
+        for name, read in sorted(self._gauges.items()):
+            try:
+                value = read()
+            except Exception as e:
+                log_event("gauge_error", logging.WARNING, gauge=name, error=str(e))
+                continue
+            header(name, "gauge")
+            lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+registry.describe("interns_span_duration_seconds", "Time spent in instrumented operations")
+registry.describe("interns_http_request_duration_seconds", "Request latency by endpoint")
+registry.describe("interns_http_requests_total", "Requests by endpoint, method and status")
+
+_local = threading.local()
+
+
+def record_span(name, elapsed):
+    """Add elapsed seconds to interns_span_duration_seconds and to the current request's log line"""
+    registry.observe("interns_span_duration_seconds", elapsed, span=name)
+    spans = getattr(_local, "spans", None)
+    if spans is not None:
+        spans[name] = spans.get(name, 0.0) + elapsed
+
+
+@contextmanager
+def span(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - started)
+
+
+def timed(name):
+    """Decorator form of span()"""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ----------------- FLASK -----------------
+_profiler_lock = threading.Lock()
+
+
+def _profile_requested(request):
+    return PROFILING and (request.args.get("_profile") == "1" or request.headers.get("X-Profile") == "1")
+
+
+def _hottest_frames(profiler):
+    import pstats
+    stats = pstats.Stats(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP]
+    return [{"function": f"{os.path.basename(filename)}:{line}({func})", "calls": nc,
+             "total_ms": round(tt * 1000, 3), "cumulative_ms": round(ct * 1000, 3)}
+            for (filename, line, func), (cc, nc, tt, ct, callers) in rows]
+
+
+def init_app(app):
+    """Time every request and template render, log one line per request and serve /metrics"""
+    from flask import Response, g, request, before_render_template, template_rendered
+
+    configure_log()
+
+    @app.before_request
+    def start_request():
+        _local.spans = {}
+        g.request_started = time.perf_counter()
+        g.profiler = None
+        if _profile_requested(request) and _profiler_lock.acquire(blocking=False):
+            # Only one profiler can run at a time
+            import cProfile
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    @app.after_request
+    def finish_request(response):
+        started = g.pop("request_started", None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        endpoint = request.endpoint or "unmatched"
+        registry.observe("interns_http_request_duration_seconds", elapsed, endpoint=endpoint)
+        registry.inc("interns_http_requests_total", endpoint=endpoint, method=request.method,
+                     status=response.status_code)
+        # The route pattern, not the path: paths can carry secrets such as /reset-password/<token>
+        rule = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+        fields = {"method": request.method, "path": rule, "endpoint": endpoint,
+                  "status": response.status_code, "duration_ms": round(elapsed * 1000, 3),
+                  "spans_ms": {k: round(v * 1000, 3) for k, v in (getattr(_local, "spans", None) or {}).items()}}
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            _profiler_lock.release()
+            fields["profile"] = _hottest_frames(profiler)
+        _local.spans = None
+        slow = elapsed >= SLOW_REQUEST_SECONDS
+        log_event("request", logging.WARNING if slow else logging.INFO, **fields)
+        return response
+
+    @app.teardown_request
+    def drop_profiler(exc):
+        # after_request is skipped when a view raises
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            _profiler_lock.release()
+        _local.spans = None
+
+    def template_started(sender, template, context, **extra):
+        g.setdefault("template_started", []).append(time.perf_counter())
+
+    def template_done(sender, template, context, **extra):
+        stack = g.get("template_started")
+        if stack:
+            record_span(f"template:{template.name}", time.perf_counter() - stack.pop())
+
+    before_render_template.connect(template_started, app, weak=False)
+    template_rendered.connect(template_done, app, weak=False)
+
+    @app.route("/metrics")
+    def metrics():
+        token = os.environ.get("INTERNS_METRICS_TOKEN")
+        if token and request.headers.get("Authorization") != f"Bearer {token}":
+            return Response("unauthorized\n", status=401, mimetype="text/plain")
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,72 @@
+"""Check analytics.BoundedCounter against exact counts on skewed and uniform
+streams much larger than its capacity: no count above the truth or more than
+error below it, no key counted more than error times lost, and error under
+2 * total / capacity.
+
+    python scripts/analytics_bounds.py
+    python scripts/analytics_bounds.py --capacity 50 --length 200000 --seeds 20
+"""
+import argparse, os, random, sys
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def streams(length, keys, seed):
+    """(name, keys) pairs: Zipf-like skew, skew arriving in bursts, and uniform"""
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(keys)]
+    yield "zipf", rng.choices(range(keys), weights, k=length)
+    bursty = []
+    while len(bursty) < length:
+        # A frequent key recurs between long runs of one-off keys, so it is evicted again and again
+        bursty.append(rng.randrange(20))
+        bursty.extend(rng.randrange(keys) for _ in range(rng.randrange(1, 200)))
+    yield "bursts", bursty[:length]
+    yield "uniform", [rng.randrange(keys) for _ in range(length)]
+
+
+def check(name, stream, capacity):
+    from analytics import BoundedCounter
+    counter, exact = BoundedCounter(capacity), Counter(stream)
+    for key in stream:
+        counter.add(key)
+    problems = []
+    if len(counter.counts) > capacity:
+        problems.append(f"{len(counter.counts)} entries kept")
+    if counter.error >= 2 * len(stream) / capacity:
+        problems.append(f"error {counter.error} not under 2 * {len(stream)} / {capacity}")
+    for key, true in exact.items():
+        got = counter.counts.get(key)
+        if got is None:
+            if true > counter.error:
+                problems.append(f"key {key} counted {true} times but dropped")
+        elif not true - counter.error <= got <= true:
+            problems.append(f"key {key} counted {got}, truly {true}")
+    worst = max(true - counter.counts.get(key, 0) for key, true in exact.items())
+    print(f"{name:10} keys={len(exact):6} error={counter.error:5} worst undercount={worst:5} "
+          f"{'ok' if not problems else 'FAIL'}")
+    return [f"{name}: {p}" for p in problems[:10]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--capacity", type=int, default=100)
+    parser.add_argument("--length", type=int, default=100000)
+    parser.add_argument("--keys", type=int, default=20000, help="distinct keys a stream draws from")
+    parser.add_argument("--seeds", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    failures = []
+    for seed in range(args.seeds):
+        for name, stream in streams(args.length, args.keys, seed):
+            failures += check(f"{name}/{seed}", stream, args.capacity)
+    for f in failures:
+        print(f)
+    print(f"\n{len(failures)} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Print the analytics report (or save one of its charts) for a workbook or
+SQLite database, streaming the rows so files larger than memory work too.
+
+    python scripts/analytics_report.py interns.xlsx
+    python scripts/analytics_report.py interns.db --chart skill-pairs --out pairs.png
+"""
+import argparse, json, os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    sys.path.insert(0, ROOT)
+    import analytics
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="an interns .xlsx workbook or the .db of INTERNS_STORAGE=sqlite")
+    parser.add_argument("--chart", choices=analytics.CHARTS, help="write this chart instead of printing JSON")
+    parser.add_argument("--out", help="PNG file for --chart (default <chart>.png)")
+    parser.add_argument("--max-keys", type=int, default=analytics.MAX_KEYS, help="memory bound per aggregate")
+    args = parser.parse_args()
+
+    if args.source.endswith(".db"):
+        rows = analytics.stream_database(args.source)
+    else:
+        rows = analytics.stream_workbook(args.source)
+    report = analytics.build_report(rows, args.max_keys)
+    if args.chart:
+        out = args.out or f"{args.chart}.png"
+        with open(out, "wb") as f:
+            f.write(analytics.render(args.chart, report))
+        print(f"Wrote {out}")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
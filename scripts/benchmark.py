@@ -0,0 +1,290 @@
+"""Measure how the app slows down as the intern and user workbooks grow.
+
+For each dataset size a fresh process gets synthetic interns.xlsx and
+registers.xlsx files, drives the routes through the Flask test client and
+times StudentManager, storage, chart and login operations directly. Results
+can be saved as a baseline and later runs compared against it.
+
+    python scripts/benchmark.py --sizes 1000,10000,100000
+    python scripts/benchmark.py --save-baseline
+    python scripts/benchmark.py            # fails if slower than the baseline
+    python scripts/benchmark.py --backend all --sizes 10000   # compare storage backends
+"""
+import argparse, json, multiprocessing, os, random, shutil, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "scripts", "benchmark_baseline.json")
+BRANCHES = ["CSE", "ECE", "EEE", "IT", "MECH", "CIVIL"]
+YEARS = ["1st Year", "2nd Year", "3rd Year", "4th Year"]
+EDUCATION = ["BTech", "BE", "BSc", "MSc", "MCA"]
+SKILLS = ["Python", "Java", "C", "C++", "JavaScript", "SQL", "Excel", "React", "Django", "Flask", "Go"]
+INTERESTS = ["ML", "Testing", "Development", "Data Science", "Cloud Computing", "Web Development",
+             "Cyber Security", "AI", "UI/UX", "DevOps", "Embedded Systems", "Other"]
+PASSWORD = "benchmark-pass"
+BACKENDS = ["memory", "excel", "journal", "sqlite"]
+
+
+# ----------------- DATA -----------------
+def synthetic_interns(count, rng):
+    for i in range(1, count + 1):
+        yield {
+            "name": f"Intern {i}",
+            "email": f"intern{i}@example.com",
+            "phone": 9000000000 + i,
+            "education": rng.choice(EDUCATION),
+            "branch": rng.choice(BRANCHES),
+            "year": rng.choice(YEARS),
+            "skills": ", ".join(rng.sample(SKILLS, rng.randint(1, 4))),
+            "interest": ", ".join(rng.sample(INTERESTS, rng.randint(1, 3))),
+            "id": i,
+        }
+
+
+def synthetic_users(count, password_hash):
+    for i in range(1, count + 1):
+        yield {
+            "fullname": f"User {i}",
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "password": password_hash,
+            "created_at": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d} 10:00:00",
+        }
+
+
+# ----------------- TIMING -----------------
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    total = sum(samples)
+    return {
+        "n": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "ops_per_s": round(len(samples) / total, 1) if total else 0.0,
+    }
+
+
+def timed(fn, repeat, setup=None):
+    samples = []
+    for i in range(repeat):
+        if setup:
+            setup(i)
+        started = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Kilobytes on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+# ----------------- ONE DATASET -----------------
+def run_size(size, repeat, backend, data_dir, results):
+    results.put(bench_size(size, repeat, backend, data_dir))
+
+
+def bench_size(size, repeat, backend, data_dir):
+    sys.path.insert(0, ROOT)
+    from werkzeug.security import generate_password_hash
+    from storage import write_records, snapshot_path
+    rng = random.Random(size)
+    hash_method = "pbkdf2:sha256:1000"
+    interns_file = os.path.join(data_dir, "interns.xlsx")
+    registers_file = os.path.join(data_dir, "registers.xlsx")
+    started = time.perf_counter()
+    write_records(interns_file, list(synthetic_interns(size, rng)))
+    write_records(registers_file, list(synthetic_users(max(size // 10, 1),
+                                                       generate_password_hash(PASSWORD, hash_method))))
+    # Time a cold start that has to parse the workbooks
+    os.remove(snapshot_path(interns_file))
+    os.remove(snapshot_path(registers_file))
+    generate_s = time.perf_counter() - started
+
+    os.environ.update({
+        "INTERNS_EXCEL_FILE": interns_file,
+        "INTERNS_REGISTRATION_FILE": registers_file,
+        "INTERNS_STORAGE": backend,
+        "PASSWORD_HASH_METHOD": hash_method,
+        "INTERNS_LOG_LEVEL": "WARNING",
+    })
+    os.chdir(ROOT)
+    started = time.perf_counter()
+    import apps
+    report = {"size": size, "backend": backend, "generate_s": round(generate_s, 2),
+              "startup_s": round(time.perf_counter() - started, 3), "routes": {}, "operations": {}}
+    manager = apps.student_manager
+
+    # ----- routes -----
+    client = apps.app.test_client()
+    routes = report["routes"]
+    routes["POST /login"] = timed(lambda i: client.post(
+        "/login", data={"username": f"user{i % max(size // 10, 1) + 1}", "password": PASSWORD}), repeat)
+    with client.session_transaction() as session:
+        session["user"], session["user_name"] = "bench", "Benchmark"
+
+    def uncached(path):
+        def get(i):
+            apps.page_cache.invalidate()
+            client.get(path)
+        return get
+
+    routes["GET /home"] = timed(uncached("/home"), repeat)
+    routes["GET /home (cached)"] = timed(lambda i: client.get("/home"), repeat)
+    routes["GET /interns"] = timed(lambda i: client.get(f"/interns?page={i % 20 + 1}"), repeat)
+    routes["GET /interns?branch"] = timed(lambda i: client.get(f"/interns?branch={BRANCHES[i % 6]}&page={i}"), repeat)
+    routes["GET /interns?q"] = timed(lambda i: client.get(f"/interns?q=intern{i}"), repeat)
+    routes["GET /search"] = timed(lambda i: client.get(f"/search?q={SKILLS[i % len(SKILLS)]}"), repeat)
+
+    added = []
+
+    def new_entry(i):
+        form = {"name": f"Bench {i}", "email": f"bench{i}@example.com", "phone": "1", "education": "BTech",
+                "branch": "CSE", "year": "1st Year", "skills": "Python", "interest": "Testing"}
+        client.post("/new-entry", data=form)
+        added.append(manager.next_id - 1)
+
+    routes["POST /new-entry"] = timed(new_entry, repeat)
+    routes["POST /edit"] = timed(lambda i: client.post(f"/edit/{added[i]}", data={
+        "name": f"Bench {i}", "email": f"bench{i}@example.com", "phone": "2", "education": "BTech",
+        "branch": "IT", "year": "2nd Year", "skills": "Go", "interest": "DevOps"}), repeat)
+    routes["POST /delete"] = timed(lambda i: client.post(f"/delete/{added[i]}"), repeat)
+
+    # ----- StudentManager and friends -----
+    ops = report["operations"]
+    ids = [s["id"] for s in manager.first_students(repeat)]
+    student = {"name": "Op", "email": "op@example.com", "phone": "3", "education": "BSc",
+               "branch": "ECE", "year": "3rd Year", "skills": "C", "interest": "AI"}
+    new_rows = [dict(student) for _ in range(repeat)]
+    ops["add_student"] = timed(lambda i: manager.add_student(new_rows[i]), repeat)
+    new_ids = [row["id"] for row in new_rows]
+    ops["update_student"] = timed(lambda i: manager.update_student(new_ids[i], {"skills": f"C, Go {i}"}), repeat)
+    ops["delete_student"] = timed(lambda i: manager.delete_student(new_ids[i]), repeat)
+    ops["get_student"] = timed(lambda i: manager.get_student(ids[i % len(ids)]), repeat)
+    ops["query(branch)"] = timed(lambda i: manager.query(branch=BRANCHES[i % 6]), repeat)
+    ops["find(q)"] = timed(lambda i: manager.find(q=f"intern{i}"), repeat)
+    ops["top_interests"] = timed(lambda i: manager.top_interests(10), repeat)
+    ops["save_to_excel"] = timed(lambda i: manager.save_to_excel(), max(repeat // 10, 1),
+                                 setup=lambda i: manager.update_student(ids[0], {"phone": str(i)}))
+    ops["render_chart"] = timed(lambda i: apps.render_chart(manager.top_interests(10)), max(repeat // 10, 1))
+    ops["analytics_report"] = timed(lambda i: manager.scan(apps.analytics.Report().add), max(repeat // 10, 1))
+    ops["authenticate"] = timed(lambda i: apps.user_store.authenticate(f"user{i + 1}", PASSWORD), repeat)
+
+    manager.storage.close()
+    report["peak_rss_mb"] = peak_rss_mb()
+    return report
+
+
+# ----------------- REPORTING -----------------
+def print_report(report, baseline=None):
+    print(f"\n== {report['size']} interns ({report.get('backend', 'journal')}): startup {report['startup_s']}s, "
+          f"peak RSS {report['peak_rss_mb']} MB (data generated in {report['generate_s']}s)")
+    print(f"{'':28} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'ops/s':>10} {'vs base':>8}")
+    for group in ("routes", "operations"):
+        for name, stats in report[group].items():
+            ratio = ""
+            base = (baseline or {}).get(group, {}).get(name)
+            if base and base["p50_ms"]:
+                ratio = f"{stats['p50_ms'] / base['p50_ms']:.2f}x"
+            print(f"{name:28} {stats['p50_ms']:>10} {stats['p95_ms']:>10} {stats['p99_ms']:>10} "
+                  f"{stats['ops_per_s']:>10} {ratio:>8}")
+
+
+def print_comparison(reports, sizes, backends):
+    """p50 of every route and operation side by side, one column per backend"""
+    for size in sizes:
+        runs = [reports[run_key(size, b)] for b in backends]
+        print(f"\n== {size} interns, p50 ms")
+        print(f"{'':28}" + "".join(f"{b:>10}" for b in backends))
+        print(f"{'startup s':28}" + "".join(f"{r['startup_s']:>10}" for r in runs))
+        for group in ("routes", "operations"):
+            for name in runs[0][group]:
+                print(f"{name:28}" + "".join(f"{r[group].get(name, {}).get('p50_ms', ''):>10}" for r in runs))
+
+
+def run_key(size, backend):
+    """Baseline key; journal runs keep the plain size used before other backends were benchmarked"""
+    return str(size) if backend == "journal" else f"{backend}:{size}"
+
+
+def regressions(report, baseline, tolerance, floor_ms=1.0):
+    """Timings whose median grew past tolerance times the baseline (ignoring ones under floor_ms)"""
+    found = []
+    for group in ("routes", "operations"):
+        for name, stats in report[group].items():
+            base = baseline.get(group, {}).get(name)
+            if base and max(stats["p50_ms"], base["p50_ms"]) >= floor_ms and \
+                    stats["p50_ms"] > base["p50_ms"] * tolerance:
+                found.append(f"{report['size']} {report.get('backend', 'journal')} {name}: p50 {base['p50_ms']} -> {stats['p50_ms']} ms")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000", help="comma separated intern counts, e.g. 1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=50, help="timed calls per route or operation")
+    parser.add_argument("--backend", default="journal", help=f"one of {', '.join(BACKENDS)}, a comma separated list or all")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown against the baseline")
+    parser.add_argument("--json", help="also write the full results here")
+    args = parser.parse_args()
+    backends = BACKENDS if args.backend == "all" else args.backend.split(",")
+    unknown = [b for b in backends if b not in BACKENDS]
+    if unknown:
+        parser.error(f"unknown backend: {', '.join(unknown)}")
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    # A fresh process per size, so imports, caches and peak RSS don't carry over
+    ctx = multiprocessing.get_context("spawn")
+    reports, problems = {}, []
+    for size in sizes:
+        for backend in backends:
+            key = run_key(size, backend)
+            results = ctx.Queue()
+            data_dir = tempfile.mkdtemp(prefix=f"interns-bench-{size}-")
+            proc = ctx.Process(target=run_size, args=(size, args.repeat, backend, data_dir, results))
+            proc.start()
+            report = results.get()
+            proc.join()
+            shutil.rmtree(data_dir, ignore_errors=True)
+            reports[key] = report
+            print_report(report, baseline.get(key))
+            if key in baseline and not args.save_baseline:
+                problems += regressions(report, baseline[key], args.tolerance)
+    if len(backends) > 1:
+        print_comparison(reports, sizes, backends)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(dict(baseline, **reports), f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+    for p in problems:
+        print(f"REGRESSION: {p}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
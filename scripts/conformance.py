@@ -0,0 +1,235 @@
+"""Run the same checks against StudentManager and UserStore on every storage
+backend, so a backend (or an optimization in one) can't quietly behave
+differently from the others.
+
+    python scripts/conformance.py                   # all backends
+    python scripts/conformance.py --backend sqlite
+"""
+import argparse, os, shutil, sys, tempfile, traceback
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKENDS = ["memory", "excel", "journal", "sqlite"]
+HASH_METHOD = "pbkdf2:sha256:1000"
+CHECKS = []
+
+
+def check(fn):
+    CHECKS.append(fn)
+    return fn
+
+
+def intern(name, branch="CSE", interest="ML, Testing", **fields):
+    return dict({"name": name, "email": f"{name.lower()}@example.com", "phone": "1", "education": "BTech",
+                 "branch": branch, "year": "1st Year", "skills": "Python", "interest": interest}, **fields)
+
+
+class Env:
+    """Fresh data files for one check on one backend"""
+    def __init__(self, backend, data_dir):
+        self.backend = backend
+        self.interns = os.path.join(data_dir, "interns.xlsx")
+        self.registers = os.path.join(data_dir, "registers.xlsx")
+        self._open = []
+
+    @property
+    def persistent(self):
+        return self.backend != "memory"
+
+    def students(self):
+        from storage import make_storage
+        from students import StudentManager
+        manager = StudentManager(self.interns, make_storage(self.interns, self.backend))
+        self._open.append(manager.storage)
+        return manager
+
+    def users(self, builtin=None):
+        from storage import make_storage
+        from user_store import UserStore
+        store = UserStore(make_storage(self.registers, self.backend, key="username"), hash_method=HASH_METHOD,
+                          builtin=builtin)
+        self._open.append(store)
+        return store
+
+    def close(self):
+        for thing in reversed(self._open):
+            thing.close()
+        self._open = []
+
+
+# ----------------- STUDENTS -----------------
+@check
+def add_and_get(env):
+    m = env.students()
+    assert len(m) == 0
+    m.add_student(intern("Asha"))
+    [sid] = [s["id"] for s in m.all_students()]
+    assert sid == 1, sid
+    assert m.get_student(sid)["name"] == "Asha"
+    assert m.get_student(999) is None
+
+
+@check
+def batch(env):
+    m = env.students()
+    added, _, _ = m.apply_batch(creates=[intern("A"), intern("B"), intern("C")])
+    assert added == [1, 2, 3], added
+    added, updated, deleted = m.apply_batch(creates=[intern("D")], updates=[{"id": 1, "skills": "Go"}, {"id": 99}],
+                                            deletes=[2, 98])
+    assert (added, updated, deleted) == ([4], [1], [2]), (added, updated, deleted)
+    assert [s["id"] for s in m.all_students()] == [1, 3, 4]
+    assert m.get_student(1)["skills"] == "Go" and m.get_student(1)["name"] == "A"
+
+
+@check
+def indexes_follow_changes(env):
+    m = env.students()
+    m.add_students([intern("A", branch="CSE"), intern("B", branch="ECE"), intern("C", branch="cse", interest="AI")])
+    assert [s["name"] for s in m.query(branch="CSE")] == ["A", "C"]
+    assert m.count_by("branch") == {"cse": 2, "ece": 1}
+    m.update_student(1, {"branch": "IT"})
+    assert [s["name"] for s in m.query(branch="CSE")] == ["C"]
+    assert [s["name"] for s in m.query(branch="it")] == ["A"]
+    m.delete_student(3)
+    assert m.query(branch="CSE") == []
+    assert [s["name"] for s in m.query(interest="ml")] == ["A", "B"]
+    assert [s["name"] for s in m.find(q="b@example")] == ["B"]
+    assert [s["name"] for s in m.find(sort="name", descending=True)] == ["B", "A"]
+    assert dict(m.top_interests(5)) == {"Machine Learning": 2, "Testing": 2}, m.top_interests(5)
+
+
+@check
+def versions_and_changelog(env):
+    m = env.students()
+    before = m.version()
+    m.add_student(intern("A"))
+    m.update_student(1, {"skills": "Go"})
+    m.update_student(1, {"skills": "Go"})
+    m.delete_student(1)
+    assert m.version() != before
+    events = m.changelog.since(0)
+    assert [(e["seq"], e["op"]) for e in events] == [(1, "add"), (2, "update"), (3, "delete")], events
+    assert events[1]["changes"] == {"skills": ["Python", "Go"]}
+
+
+@check
+def survives_reopening(env):
+    if not env.persistent:
+        return
+    m = env.students()
+    m.add_students([intern("A"), intern("B")])
+    m.update_student(2, {"year": "2nd Year"})
+    m.save_to_excel()
+    m.add_student(intern("C"))
+    env.close()
+    m = env.students()
+    assert [(s["id"], s["name"]) for s in m.all_students()] == [(1, "A"), (2, "B"), (3, "C")]
+    assert m.get_student(2)["year"] == "2nd Year"
+    m.add_student(intern("D"))
+    assert m.next_id == 5
+    assert m.changelog.latest() == 5
+
+
+@check
+def shared_between_managers(env):
+    if not env.persistent:
+        return
+    a, b = env.students(), env.students()
+    a.add_student(intern("A"))
+    b.add_student(intern("B"))
+    a.update_student(2, {"skills": "Rust"})
+    for m in (a, b):
+        assert [(s["id"], s["name"], s["skills"]) for s in m.all_students()] == [(1, "A", "Python"), (2, "B", "Rust")]
+        assert [s["name"] for s in m.query(branch="cse")] == ["A", "B"]
+    assert a.version()[1:] == b.version()[1:]
+
+
+@check
+def history_stays_bounded(env):
+    m = env.students()
+    storage = m.storage
+    if env.backend == "sqlite":
+        storage.KEEP_CHANGES, storage.PRUNE_BATCH = 50, 10
+    lagging = env.students() if env.persistent else None
+    m.add_student(intern("A"))
+    for i in range(300):
+        m.update_student(1, {"phone": str(i)})
+    if env.backend == "sqlite":
+        rows = storage._execute("SELECT COUNT(*) FROM changelog")[0][0]
+        assert rows <= 60, f"{rows} changelog rows kept"
+    if lagging is not None:
+        # Behind the pruned history, it has to reload rather than miss changes
+        assert lagging.get_student(1)["phone"] == "299"
+
+
+# ----------------- USERS -----------------
+@check
+def users(env):
+    store = env.users(builtin={"admin": {"username": "admin", "password": "admin123", "name": "Administrator"}})
+    user = {"fullname": "Asha", "username": "asha", "email": "Asha@Example.com", "password": "pw-1"}
+    assert store.add_user(dict(user))
+    assert not store.add_user(dict(user, email="other@example.com"))
+    assert not store.add_user(dict(user, username="asha2"))
+    assert store.authenticate("asha", "pw-1")["email"] == "asha@example.com"
+    assert store.authenticate("asha@example.com", "pw-1") is not None
+    assert "password" not in store.authenticate("asha", "pw-1")
+    assert store.authenticate("asha", "wrong") is None
+    assert store.authenticate("admin", "admin123")["name"] == "Administrator"
+    assert store.authenticate("admin", "") is None
+    assert store.set_password("ASHA@example.com", "pw-2")
+    assert store.authenticate("asha", "pw-2") and not store.authenticate("asha", "pw-1")
+    assert not store.set_password("nobody@example.com", "x")
+    # Plaintext comparisons (built-in accounts, passwords left unhashed in old workbooks) must cope with non-ASCII
+    assert store.authenticate("admin", "pässwörd") is None
+    if env.persistent:
+        env.close()
+        store = env.users()
+        assert store.authenticate("asha", "pw-2") is not None
+        assert len(store) == 1
+    store._put({"username": "old", "email": "old@example.com", "password": "pässwörd"})
+    assert store.authenticate("old", "passwort") is None
+    # Re-hashed on the first success
+    assert store.authenticate("old", "pässwörd") is not None
+    assert store.authenticate("old", "pässwörd") is not None
+
+
+# ----------------- RUNNING -----------------
+def run(backend, names=None):
+    failures = []
+    for fn in CHECKS:
+        if names and fn.__name__ not in names:
+            continue
+        data_dir = tempfile.mkdtemp(prefix=f"interns-conformance-{backend}-")
+        env, status = Env(backend, data_dir), "ok"
+        try:
+            fn(env)
+        except Exception:
+            status = "FAIL"
+            failures.append(f"{backend} {fn.__name__}:\n{traceback.format_exc()}")
+        finally:
+            try:
+                env.close()
+            finally:
+                shutil.rmtree(data_dir, ignore_errors=True)
+        print(f"{backend:8} {fn.__name__:28} {status}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", default="all", choices=["all"] + BACKENDS)
+    parser.add_argument("checks", nargs="*", help="only run these checks")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    os.environ.setdefault("INTERNS_LOG_LEVEL", "WARNING")
+    failures = []
+    for backend in BACKENDS if args.backend == "all" else [args.backend]:
+        failures += run(backend, args.checks)
+    for f in failures:
+        print(f"\n{f}")
+    print(f"\n{len(failures)} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""Copy interns.xlsx and registers.xlsx (plus any pending journal entries)
+into the SQLite databases used by INTERNS_STORAGE=sqlite.
+
+The app does this by itself the first time it starts with an empty
+database; run this to do it ahead of time, or with --force to replace the
+database contents with the workbooks again.
+
+    python scripts/sqlite_import.py [--force]
+"""
+import argparse, os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="re-import even if the database was filled before")
+    parser.add_argument("--interns", default=os.environ.get("INTERNS_EXCEL_FILE", "interns.xlsx"))
+    parser.add_argument("--registrations", default=os.environ.get("INTERNS_REGISTRATION_FILE", "registers.xlsx"))
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from storage import SQLiteStorage
+    for excel_file, key in ((args.interns, "id"), (args.registrations, "username")):
+        storage = SQLiteStorage(excel_file, key)
+        if not storage.import_workbook(force=args.force):
+            print(f"{storage.db_file} was already imported, use --force to replace it")
+        storage.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Hammer /new-entry and /edit from several worker processes sharing one
+data directory, then check that no intern IDs or rows were lost.
+
+    python scripts/stress.py --workers 4 --threads 4 --requests 50
+"""
+import argparse, multiprocessing, os, shutil, sys, tempfile, threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def worker(worker_id, data_dir, backend, threads, requests, results):
+    os.environ["INTERNS_STORAGE"] = backend
+    os.environ["INTERNS_EXCEL_FILE"] = os.path.join(data_dir, "interns.xlsx")
+    os.environ["INTERNS_REGISTRATION_FILE"] = os.path.join(data_dir, "registers.xlsx")
+    os.environ["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1000"
+    os.environ["INTERNS_LOG_LEVEL"] = "WARNING"
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    import apps
+    manager = apps.student_manager
+    errors = []
+
+    def run(thread_id):
+        client = apps.app.test_client()
+        with client.session_transaction() as session:
+            session["user"] = "stress"
+        for i in range(requests):
+            tag = f"w{worker_id}-t{thread_id}-{i}"
+            form = {"name": tag, "email": f"{tag}@example.com", "phone": "1", "education": "BTech",
+                    "branch": "CSE", "year": "1", "skills": "C", "interest": "Testing"}
+            if client.post("/new-entry", data=form).status_code != 302:
+                errors.append(f"add {tag} failed")
+                continue
+            added = manager.query(email=form["email"])
+            if len(added) != 1:
+                errors.append(f"{tag} not found after add ({len(added)} matches)")
+                continue
+            form["skills"] = f"edited-{tag}"
+            if client.post(f"/edit/{added[0]['id']}", data=form).status_code != 302:
+                errors.append(f"edit {tag} failed")
+            if i % 10 == 9:
+                manager.save_to_excel()
+
+    pool = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    manager.storage.close()
+    results.put(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=25, help="adds (each followed by an edit) per thread")
+    parser.add_argument("--backend", default="journal", choices=["journal", "excel", "sqlite"])
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="interns-stress-")
+    shutil.copy(os.path.join(ROOT, "interns.xlsx"), data_dir)
+    shutil.copy(os.path.join(ROOT, "registers.xlsx"), data_dir)
+    sys.path.insert(0, ROOT)
+    from storage import make_storage
+
+    def load():
+        storage = make_storage(os.path.join(data_dir, "interns.xlsx"), args.backend)
+        records = storage.load()
+        storage.close()
+        return records
+
+    initial = load()
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(w, data_dir, args.backend, args.threads, args.requests, results))
+             for w in range(args.workers)]
+    for p in procs:
+        p.start()
+    errors = [e for _ in procs for e in results.get()]
+    for p in procs:
+        p.join()
+
+    final = load()
+    expected = len(initial) + args.workers * args.threads * args.requests
+    ids = [int(s["id"]) for s in final]
+    if len(final) != expected:
+        errors.append(f"expected {expected} rows, found {len(final)}")
+    if len(set(ids)) != len(ids):
+        errors.append("duplicate ids")
+    unedited = [s["name"] for s in final if str(s["name"]).startswith("w") and s["skills"] != f"edited-{s['name']}"]
+    if unedited:
+        errors.append(f"{len(unedited)} edits lost, e.g. {unedited[0]}")
+
+    shutil.rmtree(data_dir)
+    for e in errors:
+        print(f"FAIL: {e}")
+    print(f"{len(final)} rows, {len(set(ids))} unique ids, {len(errors)} problems")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
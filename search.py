@@ -0,0 +1,206 @@
+import heapq, math, re, threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from interests import SEPARATORS, SPACES, aliases, canonical_interest, extract_interests
+
+# Entries split like interests; words are then lowercased and short ones
+# such as "C" or "R" are kept, since they are real skills
+WORDS = re.compile(r'[\w+#.]+')
+FIELD_WEIGHTS = {"interest": 2.0, "skills": 1.0}
+MATCH_WEIGHTS = {"exact": 1.0, "prefix": 0.7, "fuzzy": 0.5}
+
+
+def _canonical_words(token):
+    """Words of the canonical interest token names ("ml" -> machine, learning), or the token itself"""
+    interest = canonical_interest(token)
+    return WORDS.findall(interest.lower()) if interest is not None else WORDS.findall(token)
+
+
+def terms(text):
+    """Search terms of a skills value, with interest aliases spelled out as StudentManager does"""
+    if text is None:
+        return []
+    found = []
+    for entry in SEPARATORS.split(str(text)):
+        entry = SPACES.sub(" ", entry).strip().lower()
+        if entry in aliases:
+            found += _canonical_words(entry)
+        else:
+            for word in WORDS.findall(entry):
+                found += _canonical_words(word)
+    return found
+
+
+def interest_terms(text):
+    """Search terms of an interest value: the words of its canonical interests"""
+    return [word for interest in extract_interests(text) for word in WORDS.findall(interest.lower())]
+
+
+def query_terms(words):
+    """Canonical terms of one group of query words, so "ml" finds what "machine learning" does"""
+    phrase = " ".join(words)
+    if len(words) > 1 and phrase in aliases:
+        return _canonical_words(phrase)
+    found = []
+    for word in words:
+        for term in [word] if word.endswith("*") else _canonical_words(word):
+            if term not in found:
+                found.append(term)
+    return found
+
+
+def max_distance(term):
+    return 1 if len(term) < 5 else 2
+
+
+def _deletes(term, distance):
+    """Every string reachable from term by deleting up to distance characters"""
+    found, frontier = {term}, {term}
+    for _ in range(distance):
+        frontier = {t[:i] + t[i + 1:] for t in frontier for i in range(len(t))} - found
+        found |= frontier
+    return found
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance with adjacent transpositions, or limit + 1 once it is exceeded"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            if prev2 is not None and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class SearchIndex:
+    """Inverted index over interns' skills and interests.
+
+    postings maps each term to {student id: weighted term frequency}. Prefix
+    lookups bisect a sorted copy of the vocabulary, rebuilt only when a term
+    is added or disappears. Typo tolerance uses a deletion index
+    (SymSpell-style): a query term and a vocabulary term within edit distance
+    d share a string obtained by deleting at most d characters from each, so
+    candidates come from a few dict lookups rather than a vocabulary scan.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.postings = defaultdict(dict)
+        self._doc_terms = {}
+        self._deletes = defaultdict(set)
+        self._sorted_terms = None
+
+    # ----- maintenance, subscribed to StudentManager -----
+    def on_student_change(self, event, old, new):
+        with self._lock:
+            if event == "reset":
+                self.postings.clear()
+                self._doc_terms.clear()
+                self._deletes.clear()
+                self._sorted_terms = None
+                for student in new:
+                    self._add(student)
+                return
+            if old is not None:
+                self._remove(old['id'])
+            if new is not None:
+                self._add(new)
+
+    def _add(self, student):
+        weights = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in (interest_terms if field == "interest" else terms)(student.get(field)):
+                weights[term] += weight
+        sid = student['id']
+        self._doc_terms[sid] = list(weights)
+        for term, weight in weights.items():
+            if term not in self.postings:
+                self._sorted_terms = None
+                for variant in _deletes(term, max_distance(term)):
+                    self._deletes[variant].add(term)
+            self.postings[term][sid] = weight
+
+    def _remove(self, sid):
+        for term in self._doc_terms.pop(sid, ()):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(sid, None)
+            if not posting:
+                del self.postings[term]
+                self._sorted_terms = None
+                for variant in _deletes(term, max_distance(term)):
+                    self._deletes[variant].discard(term)
+                    if not self._deletes[variant]:
+                        del self._deletes[variant]
+
+    # ----- lookups -----
+    def _prefixed(self, prefix):
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        i = bisect_left(self._sorted_terms, prefix)
+        while i < len(self._sorted_terms) and self._sorted_terms[i].startswith(prefix):
+            yield self._sorted_terms[i]
+            i += 1
+
+    def _fuzzy(self, term):
+        limit = max_distance(term)
+        candidates = set()
+        for variant in _deletes(term, limit):
+            candidates |= self._deletes.get(variant, set())
+        return [t for t in candidates if t != term and edit_distance(term, t, limit) <= limit]
+
+    def _expand(self, word, fuzzy):
+        """Vocabulary terms a query word matches, with how well they match"""
+        if word.endswith("*"):
+            return [(t, MATCH_WEIGHTS["prefix"]) for t in self._prefixed(word[:-1])]
+        matches = [(word, MATCH_WEIGHTS["exact"])] if word in self.postings else []
+        if fuzzy and not matches:
+            matches = [(t, MATCH_WEIGHTS["fuzzy"]) for t in self._fuzzy(word)]
+        return matches
+
+    def _score_term(self, word, fuzzy):
+        """{student id: score} for one query word"""
+        scores = {}
+        total = max(len(self._doc_terms), 1)
+        for term, match_weight in self._expand(word, fuzzy):
+            posting = self.postings[term]
+            idf = math.log(1 + total / len(posting))
+            for sid, weight in posting.items():
+                score = weight * idf * match_weight
+                if score > scores.get(sid, 0):
+                    scores[sid] = score
+        return scores
+
+    def search(self, query, page=1, per_page=20, fuzzy=True):
+        """Ranked (student id, score) pairs for one page, plus the total match count.
+
+        Words are ANDed; "OR" separates alternatives, e.g. "python ml OR java".
+        A trailing * matches by prefix; words with no exact match fall back
+        to close spellings unless fuzzy is off.
+        """
+        groups = [[w for w in group.split()] for group in re.split(r'\s+OR\s+', query.strip())]
+        groups = [[w.lower() for w in g if w.upper() != "AND"] for g in groups]
+        with self._lock:
+            results = {}
+            for group in filter(None, groups):
+                scores = None
+                for word in query_terms(group):
+                    term_scores = self._score_term(word, fuzzy)
+                    if scores is None:
+                        scores = term_scores
+                    else:
+                        scores = {sid: s + term_scores[sid] for sid, s in scores.items() if sid in term_scores}
+                    if not scores:
+                        break
+                for sid, score in (scores or {}).items():
+                    results[sid] = max(results.get(sid, 0), score)
+        total = len(results)
+        top = heapq.nsmallest(page * per_page, results.items(), key=lambda item: (-item[1], item[0]))
+        return top[(page - 1) * per_page:], total
@@ -0,0 +1,32 @@
+// Mobile menu toggle
+document.addEventListener('DOMContentLoaded', function() {
+  const sidebar = document.querySelector('.sidebar');
+  if (window.innerWidth <= 768) {
+    sidebar.style.display = 'none';
+  }
+});
+
+// Keep the stat cards current from /api/stats without reloading the page
+const STATS_POLL_MS = 30000;
+
+document.addEventListener('DOMContentLoaded', function() {
+  const container = document.querySelector('[data-stats-url]');
+  if (!container) return;
+
+  function refreshStats() {
+    if (document.hidden) return;
+    fetch(container.dataset.statsUrl, { credentials: 'same-origin' })
+      .then(function(response) { return response.ok ? response.json() : null; })
+      .then(function(stats) {
+        if (!stats) return;
+        document.querySelectorAll('[data-stat]').forEach(function(el) {
+          const value = stats[el.dataset.stat];
+          if (value !== undefined) el.textContent = value;
+        });
+      })
+      .catch(function() {});
+  }
+
+  setInterval(refreshStats, STATS_POLL_MS);
+  document.addEventListener('visibilitychange', refreshStats);
+});
@@ -0,0 +1,16 @@
+function showSection(sectionId) {
+    document.querySelectorAll('.section').forEach(sec => sec.classList.remove('active'));
+    document.querySelectorAll('.nav-item').forEach(item => item.classList.remove('active'));
+    document.getElementById(sectionId).classList.add('active');
+    document.querySelector(`[onclick="showSection('${sectionId}')"]`).classList.add('active');
+}
+
+// Filtering, sorting and paging reload the page, so reopen the listing
+if (location.search) showSection('edit-interns');
+
+// Mobile menu toggle (simplified)
+document.addEventListener('click', function(e) {
+    if (window.innerWidth <= 992 && !e.target.closest('.sidebar')) {
+        document.querySelector('.sidebar').style.display = 'none';
+    }
+});
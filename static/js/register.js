@@ -0,0 +1,43 @@
+// Password strength indicator
+document.getElementById('password').addEventListener('input', function() {
+    const password = this.value;
+    const strengthBar = document.getElementById('strength-bar');
+    let strength = 0;
+
+    if (password.length > 0) strength += 20;
+    if (password.length >= 8) strength += 20;
+    if (/[A-Z]/.test(password)) strength += 20;
+    if (/[0-9]/.test(password)) strength += 20;
+    if (/[^A-Za-z0-9]/.test(password)) strength += 20;
+
+    strengthBar.style.width = strength + '%';
+
+    if (strength < 40) {
+        strengthBar.style.backgroundColor = '#dc3545';
+    } else if (strength < 80) {
+        strengthBar.style.backgroundColor = '#ffc107';
+    } else {
+        strengthBar.style.backgroundColor = '#28a745';
+    }
+});
+
+// Add animation to form inputs on focus
+document.querySelectorAll('.form-control').forEach(input => {
+    input.addEventListener('focus', function() {
+        this.parentElement.classList.add('focused');
+    });
+
+    input.addEventListener('blur', function() {
+        if (this.value === '') {
+            this.parentElement.classList.remove('focused');
+        }
+    });
+});
+
+// Add click animation to register button
+document.querySelector('.btn-register').addEventListener('click', function() {
+    this.style.transform = 'scale(0.98)';
+    setTimeout(() => {
+        this.style.transform = '';
+    }, 150);
+});
@@ -0,0 +1,86 @@
+import threading
+from collections import Counter
+
+
+class DashboardStats:
+    """Dashboard counters kept up to date from StudentManager and UserStore
+    change events, so reading them never walks the records.
+
+    Listeners are called as listener(event, old, new) with event one of
+    "add", "update", "delete", or "reset" (new is then every record).
+    """
+    FIELDS = ("branch", "year", "education")
+
+    def __init__(self, tokenize, normalize):
+        self._tokenize = tokenize
+        self._normalize = normalize
+        self._lock = threading.Lock()
+        self.total = 0
+        self.by_field = {field: Counter() for field in self.FIELDS}
+        # Students per interest, each student counted once
+        self.interests = Counter()
+        self.registrations_by_day = Counter()
+
+    # ----- students -----
+    def _count(self, student, sign):
+        self.total += sign
+        for field in self.FIELDS:
+            key = self._normalize(student.get(field))
+            self.by_field[field][key] += sign
+            if self.by_field[field][key] <= 0:
+                del self.by_field[field][key]
+        for token in set(self._tokenize(student.get('interest'))):
+            self.interests[token] += sign
+            if self.interests[token] <= 0:
+                del self.interests[token]
+
+    def on_student_change(self, event, old, new):
+        with self._lock:
+            if event == "reset":
+                self.total = 0
+                for counter in self.by_field.values():
+                    counter.clear()
+                self.interests.clear()
+                for student in new:
+                    self._count(student, 1)
+                return
+            if old is not None:
+                self._count(old, -1)
+            if new is not None:
+                self._count(new, 1)
+
+    # ----- users -----
+    @staticmethod
+    def _day(user):
+        return str(user.get('created_at') or '')[:10]
+
+    def on_user_change(self, event, old, new):
+        with self._lock:
+            if event == "reset":
+                self.registrations_by_day.clear()
+                for user in new:
+                    if self._day(user):
+                        self.registrations_by_day[self._day(user)] += 1
+            elif event == "add" and old is None and self._day(new):
+                self.registrations_by_day[self._day(new)] += 1
+
+    # ----- reading -----
+    @property
+    def unique_interests(self):
+        return len(self.interests)
+
+    def as_dict(self):
+        with self._lock:
+            by_month = Counter()
+            for day, count in self.registrations_by_day.items():
+                by_month[day[:7]] += count
+            return {
+                "total_students": self.total,
+                "unique_interests": len(self.interests),
+                "by_branch": dict(self.by_field["branch"].most_common()),
+                "by_year": dict(self.by_field["year"].most_common()),
+                "by_education": dict(self.by_field["education"].most_common()),
+                "top_interests": dict(self.interests.most_common(10)),
+                "registrations_by_month": dict(sorted(by_month.items())),
+                "registrations_by_day": dict(sorted(self.registrations_by_day.items())[-30:]),
+            }
@@ -0,0 +1,683 @@
+import json, logging, os, pickle, threading, time, uuid
+from locking import FileLock
+from metrics import log_event, span, timed
+
+
+def snapshot_path(excel_file):
+    return os.path.splitext(excel_file)[0] + ".snapshot.pickle"
+
+
+def read_records(excel_file, key="id"):
+    """Read every row of an Excel file as a list of dicts.
+
+    Uses the binary snapshot written alongside the workbook when it is at
+    least as new, so startup skips parsing the workbook (and importing
+    pandas). A workbook edited by hand is newer and wins.
+    """
+    snapshot = snapshot_path(excel_file)
+    try:
+        if os.path.getmtime(snapshot) >= os.path.getmtime(excel_file):
+            with open(snapshot, 'rb') as f, span("snapshot_read"):
+                return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+    if not os.path.exists(excel_file):
+        return []
+    import pandas as pd
+    with span("excel_read"):
+        df = pd.read_excel(excel_file)
+    if df.empty:
+        return []
+    # Plain Python values instead of numpy scalars, and None for empty cells
+    records = df.astype(object).where(df.notna(), None).to_dict('records')
+    # Ensure all records have id field
+    if key == "id":
+        for i, record in enumerate(records):
+            if 'id' not in record:
+                record['id'] = i + 1
+    try:
+        write_snapshot(excel_file, records)
+    except OSError as e:
+        log_event("snapshot_failed", logging.ERROR, file=excel_file, error=str(e))
+    return records
+
+
+def write_snapshot(excel_file, records):
+    snapshot = snapshot_path(excel_file)
+    with open(f"{snapshot}.tmp", 'wb') as f:
+        pickle.dump(records, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f"{snapshot}.tmp", snapshot)
+
+
+@timed("excel_write")
+def stage_records(excel_file, records):
+    """Write records to a temporary workbook and snapshot next to excel_file, returning both paths"""
+    import pandas as pd
+    token = uuid.uuid4().hex[:12]
+    tmp_file = f"{excel_file}.{token}.tmp.xlsx"
+    tmp_snapshot = f"{snapshot_path(excel_file)}.{token}.tmp"
+    try:
+        pd.DataFrame(records).to_excel(tmp_file, index=False)
+        # Written second so it is only trusted when it matches the workbook
+        with open(tmp_snapshot, 'wb') as f:
+            pickle.dump(records, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except BaseException:
+        discard_staged((tmp_file, tmp_snapshot))
+        raise
+    return tmp_file, tmp_snapshot
+
+
+def install_staged(excel_file, staged):
+    tmp_file, tmp_snapshot = staged
+    os.replace(tmp_file, excel_file)
+    os.replace(tmp_snapshot, snapshot_path(excel_file))
+
+
+def discard_staged(staged):
+    for path in staged:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def write_records(excel_file, records):
+    """Write all records to an Excel file and its snapshot, replacing both atomically"""
+    install_staged(excel_file, stage_records(excel_file, records))
+
+
+def apply_op(records, op):
+    """Apply one journal entry to a dict of records keyed by the op's id"""
+    sid = op.get('id')
+    if op['op'] == 'add':
+        records[sid] = dict(op['data'])
+    elif op['op'] == 'update':
+        if sid in records:
+            records[sid].update(op['data'])
+    elif op['op'] == 'delete':
+        records.pop(sid, None)
+
+
+def _json_default(value):
+    # numpy scalars and timestamps coming out of pandas
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+# ----------------- BACKENDS -----------------
+# Every backend supports several processes sharing the same files:
+#   with storage.transaction():      # cross-process exclusive lock
+#       ops = storage.changes()      # what other processes committed since we last looked
+#       ... apply ops, then our own change ...
+#       storage.record([op])
+# changes() returns None when the files were rewritten under us and the
+# caller has to load() from scratch. state() names the committed data a
+# process has caught up with, so workers can agree on HTTP validators.
+
+class MemoryStorage:
+    """Keeps changes in this process only, starting from the workbook if there is one.
+
+    Nothing is written back, so it suits tests, benchmarks and throwaway
+    demos, and a single worker process.
+    """
+    def __init__(self, excel_file=None, key="id"):
+        self.excel_file = excel_file
+        self.key = key
+        self.lock = threading.RLock()
+        self._commits = 0
+        self._modified = None
+
+    def attach(self, snapshot):
+        pass
+
+    def transaction(self):
+        return self.lock
+
+    def load(self):
+        if self.excel_file is None:
+            return []
+        return read_records(self.excel_file, self.key)
+
+    def has_changes(self):
+        # No other process can see this data
+        return False
+
+    def changes(self):
+        return []
+
+    def state(self):
+        return f"memory-{id(self):x}-{self._commits:x}", self._modified
+
+    def record(self, ops):
+        with self.lock:
+            self._commits += 1
+            self._modified = time.time_ns()
+
+    def compact(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ExcelStorage:
+    """Rewrites the whole workbook on every change"""
+    def __init__(self, excel_file, key="id"):
+        self.excel_file = excel_file
+        self.key = key
+        self.lock = FileLock(f"{excel_file}.lock")
+        self._snapshot = None
+        self._mtime = None
+
+    def attach(self, snapshot):
+        """Register the callable returning all current records"""
+        self._snapshot = snapshot
+
+    def transaction(self):
+        return self.lock
+
+    def _stat(self):
+        try:
+            st = os.stat(self.excel_file)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def load(self):
+        with self.lock:
+            self._mtime = self._stat()
+            return read_records(self.excel_file, self.key)
+
+    def has_changes(self):
+        return self._stat() != self._mtime
+
+    def changes(self):
+        return None if self.has_changes() else []
+
+    def state(self):
+        """(tag, mtime_ns) of the data last loaded or written, the same in every caught-up worker"""
+        if self._mtime is None:
+            return "empty", None
+        return "%x-%x-%x" % self._mtime, self._mtime[2]
+
+    def record(self, ops):
+        """Rewrite the workbook; call inside transaction() after applying changes()"""
+        with self.lock:
+            write_records(self.excel_file, self._snapshot())
+            self._mtime = self._stat()
+
+    def compact(self):
+        # Every record() already wrote the workbook
+        pass
+
+    def close(self):
+        pass
+
+
+class JournalStorage:
+    """Appends each change to a JSON-lines journal and periodically
+    compacts it back into the Excel workbook in the background.
+
+    Replaying an entry that is already part of the workbook is harmless
+    (adds overwrite, updates merge, deletes are no-ops), so a crash
+    between writing the workbook and trimming the journal loses nothing.
+
+    Other processes follow the journal by reading past their last offset.
+    Compaction writes the workbook up to some journal size without holding
+    the lock, then swaps it in and replaces the journal with a marker
+    (naming a new generation, the previous one and that size) followed by
+    whatever was appended meanwhile. A reader that had consumed at least
+    that much of the old journal carries on instead of reloading.
+
+    Compaction runs on the given JobQueue, every compact_interval seconds
+    and whenever the journal outgrows compact_bytes; without one it only
+    happens on compact() and close().
+    """
+    def __init__(self, excel_file, key="id", journal_file=None, compact_interval=30, compact_bytes=1 << 20,
+                 jobs=None):
+        self.excel_file = excel_file
+        self.key = key
+        self.journal_file = journal_file or os.path.splitext(excel_file)[0] + ".journal.jsonl"
+        self.compact_interval = compact_interval
+        self.compact_bytes = compact_bytes
+        self.lock = FileLock(f"{self.journal_file}.lock")
+        self._generation = None
+        self._offset = 0
+        self._seen = None
+        self._snapshot = None
+        self.jobs = jobs
+        if jobs is not None:
+            jobs.every(compact_interval, self._job_key, self.compact, name="compact")
+
+    @property
+    def _job_key(self):
+        return ("compact", self.journal_file)
+
+    def _schedule_compaction(self):
+        if self.jobs is not None:
+            self.jobs.submit(self._job_key, self.compact, name="compact")
+
+    def attach(self, snapshot):
+        """Register the callable returning all current records"""
+        self._snapshot = snapshot
+        self._schedule_compaction()
+
+    def transaction(self):
+        return self.lock
+
+    def _stat(self):
+        try:
+            st = os.stat(self.journal_file)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def _read(self, offset, repair=False):
+        """Parse complete journal entries from offset, returning (ops, new offset).
+
+        An incomplete last line is either being written right now or was torn
+        by a crash; with repair (only under the lock) it is cut off.
+        """
+        ops = []
+        try:
+            f = open(self.journal_file, 'rb')
+        except FileNotFoundError:
+            return ops, offset
+        with f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete entry")
+                    if line.strip():
+                        ops.append(json.loads(line))
+                except ValueError:
+                    if repair:
+                        self._truncate(offset)
+                    break
+                offset += len(line)
+        return ops, offset
+
+    def _truncate(self, offset):
+        log_event("journal_truncated", logging.WARNING, file=self.journal_file, offset=offset)
+        with open(self.journal_file, 'r+b') as f:
+            f.truncate(offset)
+
+    def _marker(self):
+        """(generation, marker, marker length) of the current journal file"""
+        try:
+            with open(self.journal_file, 'rb') as f:
+                line = f.readline()
+        except FileNotFoundError:
+            return None, None, 0
+        try:
+            op = json.loads(line) if line.endswith(b"\n") else None
+        except ValueError:
+            op = None
+        if op and op.get('op') == 'compacted':
+            return op['generation'], op, len(line)
+        return None, None, 0
+
+    def load(self):
+        """Load the workbook and replay the journal on top of it"""
+        with self.lock:
+            records = {r[self.key]: r for r in read_records(self.excel_file, self.key)}
+            self._generation = self._marker()[0]
+            ops, self._offset = self._read(0, repair=True)
+            for op in ops:
+                apply_op(records, op)
+            self._seen = self._stat()
+        return list(records.values())
+
+    def has_changes(self):
+        return self._stat() != self._seen
+
+    def changes(self):
+        """Entries appended by other processes since the last call, or None if a reload is needed"""
+        st = self._stat()
+        if st == self._seen:
+            return []
+        generation, marker, marker_len = self._marker()
+        if generation != self._generation:
+            if marker and marker['previous'] == self._generation and marker['size'] <= self._offset:
+                # What we read past the compacted size was carried over after the marker
+                self._generation, self._offset = generation, marker_len + self._offset - marker['size']
+            else:
+                return None
+        ops, self._offset = self._read(self._offset)
+        self._seen = st
+        return ops
+
+    def state(self):
+        """(tag, mtime_ns) of the journal position consumed so far, the same in every caught-up worker"""
+        return f"{self._generation or 0}-{self._offset:x}", self._seen[2] if self._seen else None
+
+    @timed("journal_append")
+    def record(self, ops):
+        """Append ops; call inside transaction() after applying changes()"""
+        lines = "".join(json.dumps(op, default=_json_default) + "\n" for op in ops)
+        with self.lock:
+            st = self._stat()
+            if st and st[1] > self._offset:
+                with open(self.journal_file, 'rb') as f:
+                    f.seek(self._offset)
+                    if b"\n" in f.read():
+                        raise RuntimeError("record() called without applying changes() first")
+                # Everything complete has been consumed by changes(), the rest is a torn write
+                self._truncate(self._offset)
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+                self._offset = f.tell()
+            self._seen = self._stat()
+        if self._offset >= self.compact_bytes:
+            self._schedule_compaction()
+
+    @timed("journal_compact")
+    def compact(self):
+        """Materialize the workbook and start a fresh journal"""
+        with self.lock:
+            generation, _, marker_len = self._marker()
+            st = self._stat()
+            if st is None or st[1] <= marker_len:
+                return
+            size = st[1]
+            if (generation, size) == (self._generation, self._offset) and self._snapshot is not None:
+                records = self._snapshot()
+            else:
+                # Our in-memory copy is behind, rebuild from the files instead
+                records = {r[self.key]: r for r in read_records(self.excel_file, self.key)}
+                for op in self._read(0, repair=True)[0]:
+                    apply_op(records, op)
+                records = list(records.values())
+        # The slow part, writers carry on appending meanwhile
+        staged = stage_records(self.excel_file, records)
+        try:
+            with self.lock:
+                if self._marker()[0] != generation:
+                    # Another process compacted first
+                    return
+                with open(self.journal_file, 'rb') as f:
+                    f.seek(size)
+                    tail = f.read()
+                # Only complete entries, an unfinished one was torn by a crash
+                tail = tail[:tail.rfind(b"\n") + 1]
+                install_staged(self.excel_file, staged)
+                marker = {"op": "compacted", "generation": uuid.uuid4().hex, "previous": generation, "size": size}
+                tmp_file = f"{self.journal_file}.tmp"
+                with open(tmp_file, 'wb') as f:
+                    f.write(json.dumps(marker).encode() + b"\n" + tail)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.journal_file)
+                # Our own offset moves past the marker on the next changes() call
+        finally:
+            discard_staged(staged)
+
+    def close(self):
+        """Stop compacting in the background and flush everything to the workbook"""
+        if self.jobs is not None:
+            self.jobs.cancel(self._job_key)
+        self.compact()
+
+
+# ----------------- SQLITE -----------------
+# Columns kept as real (indexable) columns per record kind; anything else
+# a record carries goes into a JSON "extra" column.
+SQLITE_TABLES = {
+    "id": ("students", ("name", "email", "phone", "education", "branch", "year", "skills", "interest")),
+    "username": ("users", ("fullname", "email", "password", "created_at")),
+}
+
+
+def _migrations(table, key, columns):
+    """Schema changes in order; PRAGMA user_version counts how many ran"""
+    key_column = "id INTEGER PRIMARY KEY" if key == "id" else f"{key} TEXT PRIMARY KEY"
+    return [
+        f"""CREATE TABLE {table} ({key_column}, {", ".join(columns)}, extra TEXT);
+            CREATE TABLE changelog (seq INTEGER PRIMARY KEY AUTOINCREMENT, ts INTEGER NOT NULL, op TEXT NOT NULL);
+            CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT)""",
+        f"CREATE INDEX {table}_email ON {table} (email)",
+    ]
+
+
+class SQLiteStorage:
+    """Records in a SQLite database next to the workbook.
+
+    Every commit updates the table and appends its ops to a changelog in
+    one SQL transaction; other processes follow the changelog by sequence
+    number, as they follow the journal of JournalStorage. The database runs
+    in WAL mode, so readers never wait for a writer.
+
+    On first use the table is filled from the workbook. With export_interval
+    and a JobQueue the workbook (and its snapshot) is regenerated from the
+    database in the background for people who read the spreadsheet; it is
+    never read back once the database exists.
+    """
+    # Changelog entries kept for lagging readers; record() prunes older ones, PRUNE_BATCH at a time
+    KEEP_CHANGES = 10000
+    PRUNE_BATCH = 1000
+
+    def __init__(self, excel_file, key="id", db_file=None, export_interval=0, jobs=None):
+        import sqlite3
+        self.excel_file = excel_file
+        self.key = key
+        self.db_file = db_file or os.path.splitext(excel_file)[0] + ".db"
+        self.table, self.columns = SQLITE_TABLES[key]
+        self.lock = FileLock(f"{self.db_file}.lock")
+        self._db = sqlite3.connect(self.db_file, check_same_thread=False, isolation_level=None)
+        self._db_lock = threading.Lock()
+        self._seq = 0
+        self._epoch = None
+        self._modified = None
+        self._data_version = None
+        self._exported_seq = None
+        self._snapshot = None
+        self.export_interval = export_interval
+        self.jobs = jobs
+        with self.lock:
+            self._execute("PRAGMA journal_mode=WAL")
+            self._execute("PRAGMA synchronous=FULL")
+            self._migrate()
+        if jobs is not None and export_interval:
+            jobs.every(export_interval, self._job_key, self.export, name="export")
+
+    @property
+    def _job_key(self):
+        return ("export", self.db_file)
+
+    def _execute(self, sql, params=()):
+        with self._db_lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _migrate(self):
+        steps = _migrations(self.table, self.key, self.columns)
+        version = self._execute("PRAGMA user_version")[0][0]
+        for i, step in enumerate(steps[version:], version + 1):
+            with self._db_lock:
+                self._db.executescript(f"BEGIN; {step}; PRAGMA user_version = {i}; COMMIT;")
+
+    def attach(self, snapshot):
+        self._snapshot = snapshot
+
+    def transaction(self):
+        return self.lock
+
+    # ----- rows -----
+    def _row_to_record(self, row):
+        record = dict(zip((self.key,) + self.columns, row))
+        extra = row[-1]
+        if extra:
+            record.update(json.loads(extra))
+        return record
+
+    def _record_to_row(self, record):
+        extra = {k: v for k, v in record.items() if k != self.key and k not in self.columns}
+        return ((record[self.key],) + tuple(record.get(c) for c in self.columns)
+                + (json.dumps(extra, default=_json_default) if extra else None,))
+
+    def _upsert(self, db, record):
+        marks = ", ".join("?" * (len(self.columns) + 2))
+        db.execute(f"INSERT OR REPLACE INTO {self.table} VALUES ({marks})", self._record_to_row(record))
+
+    def _fetch(self, db, key):
+        row = db.execute(f"SELECT * FROM {self.table} WHERE {self.key} = ?", (key,)).fetchone()
+        return None if row is None else self._row_to_record(row)
+
+    def _meta(self, name):
+        rows = self._execute("SELECT value FROM meta WHERE name = ?", (name,))
+        return rows[0][0] if rows else None
+
+    # ----- importing and exporting -----
+    def import_workbook(self, force=False):
+        """Fill the table from the workbook (and journal) if it was never imported, or replace it with force"""
+        with self.lock:
+            if self._meta("imported_from") is not None and not force:
+                return False
+            records = JournalStorage(self.excel_file, self.key).load()
+            with self._db_lock:
+                db = self._db
+                db.execute("BEGIN IMMEDIATE")
+                try:
+                    db.execute(f"DELETE FROM {self.table}")
+                    for record in records:
+                        if self.key == "id":
+                            record["id"] = int(record["id"])
+                        self._upsert(db, record)
+                    db.execute("INSERT OR REPLACE INTO meta VALUES ('imported_from', ?)",
+                               (os.path.abspath(self.excel_file),))
+                    # Everyone following the changelog has to reload
+                    db.execute("INSERT OR REPLACE INTO meta VALUES ('epoch', ?)", (uuid.uuid4().hex,))
+                    db.execute("COMMIT")
+                except BaseException:
+                    db.execute("ROLLBACK")
+                    raise
+            log_event("workbook_imported", file=self.excel_file, database=self.db_file, records=len(records))
+            return True
+
+    def export(self):
+        """Regenerate the workbook from the database if anything changed since the last export"""
+        with self.lock:
+            seq = self._execute("SELECT COALESCE(MAX(seq), 0) FROM changelog")[0][0]
+            if seq == self._exported_seq:
+                return
+            records = [self._row_to_record(r) for r in self._execute(f"SELECT * FROM {self.table}")]
+        write_records(self.excel_file, records)
+        self._exported_seq = seq
+
+    # ----- storage protocol -----
+    def load(self):
+        self.import_workbook()
+        with self.lock, self._db_lock:
+            db = self._db
+            db.execute("BEGIN")
+            try:
+                self._seq, self._modified = db.execute(
+                    "SELECT COALESCE(MAX(seq), 0), MAX(ts) FROM changelog").fetchone()
+                rows = db.execute(f"SELECT * FROM {self.table}").fetchall()
+                epoch = db.execute("SELECT value FROM meta WHERE name = 'epoch'").fetchone()
+            finally:
+                db.execute("COMMIT")
+            self._epoch = epoch and epoch[0]
+            self._data_version = db.execute("PRAGMA data_version").fetchone()[0]
+        return [self._row_to_record(r) for r in rows]
+
+    def has_changes(self):
+        # Bumped whenever another connection commits to the database
+        return self._execute("PRAGMA data_version")[0][0] != self._data_version
+
+    def changes(self):
+        """Ops other processes committed since the last call, or None if a reload is needed"""
+        with self._db_lock:
+            db = self._db
+            version = db.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return []
+            epoch = db.execute("SELECT value FROM meta WHERE name = 'epoch'").fetchone()
+            pruned = db.execute("SELECT value FROM meta WHERE name = 'pruned_through'").fetchone()
+            if (epoch and epoch[0]) != self._epoch or (pruned and int(pruned[0]) > self._seq):
+                return None
+            rows = db.execute("SELECT seq, ts, op FROM changelog WHERE seq > ? ORDER BY seq",
+                              (self._seq,)).fetchall()
+            self._data_version = version
+        if rows:
+            self._seq, self._modified = rows[-1][0], rows[-1][1]
+        return [json.loads(op) for _, _, op in rows]
+
+    def record(self, ops):
+        """Apply ops to the table and the changelog in one SQL transaction; call inside transaction()"""
+        if not ops:
+            return
+        ts = time.time_ns()
+        with self.lock, self._db_lock:
+            db = self._db
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                for op in ops:
+                    if op['op'] == 'add':
+                        self._upsert(db, dict(op['data'], **{self.key: op['id']}))
+                    elif op['op'] == 'update':
+                        record = self._fetch(db, op['id'])
+                        if record is not None:
+                            record.update(op['data'])
+                            self._upsert(db, record)
+                    elif op['op'] == 'delete':
+                        db.execute(f"DELETE FROM {self.table} WHERE {self.key} = ?", (op['id'],))
+                    cursor = db.execute("INSERT INTO changelog (ts, op) VALUES (?, ?)",
+                                        (ts, json.dumps(op, default=_json_default)))
+                self._prune(db, cursor.lastrowid, self.PRUNE_BATCH)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            self._seq, self._modified = cursor.lastrowid, ts
+            # Our own commit does not move data_version
+
+    def state(self):
+        """(tag, modified ns) of the last change seen, the same in every caught-up worker"""
+        return f"{self._epoch or 0}-{self._seq:x}", self._modified
+
+    def _prune(self, db, seq, batch=1):
+        """Drop changelog entries older than the last KEEP_CHANGES once batch are due; needs a write transaction"""
+        cutoff = seq - self.KEEP_CHANGES
+        pruned = db.execute("SELECT value FROM meta WHERE name = 'pruned_through'").fetchone()
+        if cutoff - (int(pruned[0]) if pruned else 0) >= batch:
+            db.execute("DELETE FROM changelog WHERE seq <= ?", (cutoff,))
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('pruned_through', ?)", (str(cutoff),))
+
+    def compact(self):
+        """Prune every changelog entry past KEEP_CHANGES and refresh the exported workbook if exports are on"""
+        with self.lock, self._db_lock:
+            db = self._db
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                self._prune(db, db.execute("SELECT COALESCE(MAX(seq), 0) FROM changelog").fetchone()[0])
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        if self.export_interval:
+            self.export()
+
+    def close(self):
+        if self.jobs is not None:
+            self.jobs.cancel(self._job_key)
+        if self.export_interval:
+            self.export()
+        with self._db_lock:
+            self._db.close()
+
+
+def make_storage(excel_file, backend="journal", key="id", jobs=None, export_interval=0):
+    """Storage for records keyed by `key` ("id" for students, "username" for users)"""
+    if backend == "memory":
+        return MemoryStorage(excel_file, key)
+    if backend == "excel":
+        return ExcelStorage(excel_file, key)
+    if backend == "journal":
+        return JournalStorage(excel_file, key, jobs=jobs)
+    if backend == "sqlite":
+        return SQLiteStorage(excel_file, key, export_interval=export_interval, jobs=jobs)
+    raise ValueError(f"Unknown storage backend: {backend}")
@@ -0,0 +1,342 @@
+import logging, os
+from datetime import datetime
+from collections import Counter, defaultdict
+from itertools import islice
+from storage import MemoryStorage, make_storage
+from locking import RWLock
+from tables import DictTable, ColumnarTable
+from interests import extract_interests, canonical_interest
+from changelog import ChangeLog, diff
+from metrics import log_event, timed
+
+
+class StudentManager:
+    """Intern records with hash indexes, backed by a pluggable storage backend.
+
+    Safe to share between threads (reader-writer lock) and between worker
+    processes using the same files: each mutation first replays whatever
+    other workers committed, under the storage's cross-process lock, and
+    reads pick up those commits before answering.
+    """
+    # Fields with a secondary hash index, besides the interest tokens
+    INDEXED_FIELDS = ("email", "branch", "year", "education")
+    TEXT_FIELDS = ("name", "email", "skills", "interest")
+    SORT_FIELDS = ("id", "name", "email", "education", "branch", "year", "interest")
+
+    def __init__(self, excel_file, storage=None, columnar=False, changelog=None):
+        self.excel_file = excel_file
+        self.storage = storage or make_storage(excel_file, "journal" if excel_file else "memory")
+        # Changes made through this manager, for consumers syncing incrementally;
+        # kept beside the data, or only in memory when the data is
+        if changelog is None:
+            persistent = excel_file is not None and not isinstance(self.storage, MemoryStorage)
+            changelog = ChangeLog(os.path.splitext(excel_file)[0] + ".changes.jsonl" if persistent else None)
+        self.changelog = changelog
+        self._rw = RWLock()
+        if columnar:
+            self._table = ColumnarTable(extract_interests, self._index_key)
+        else:
+            self._table = DictTable(extract_interests)
+        # Categorical columns of a columnar table answer their own queries
+        self._indexed = tuple(f for f in self.INDEXED_FIELDS if f not in self._table.CATEGORICAL)
+        self._indexes = {field: defaultdict(set) for field in self._indexed + ("interest",)}
+        self._listeners = []
+        # Bumped on every mutation so caches can tell when to rebuild
+        self.data_version = 0
+        self.next_id = 1
+        self.load_from_excel()
+        self.storage.attach(self.snapshot)
+
+    @timed("students.load")
+    def load_from_excel(self):
+        """Load students from the storage backend on startup"""
+        with self.storage.transaction(), self._rw.write():
+            self._table.clear()
+            for index in self._indexes.values():
+                index.clear()
+            for student in self.storage.load():
+                student['id'] = int(student['id'])
+                self._table.put(student['id'], student)
+                self._index(student)
+                # Set next_id based on existing data
+                self.next_id = max(self.next_id, student['id'] + 1)
+            self.data_version += 1
+            self._notify("reset", None, list(self._table.values()))
+
+    # ----- cross-worker sync -----
+    def _sync(self):
+        """Apply what other workers committed; needs the storage transaction and the write lock"""
+        ops = self.storage.changes()
+        if ops is None:
+            self.load_from_excel()
+            return
+        for op in ops:
+            self._apply(op)
+
+    def refresh(self):
+        """Pick up changes committed by other worker processes"""
+        if self.storage.has_changes():
+            with self.storage.transaction(), self._rw.write():
+                self._sync()
+
+    def version(self):
+        """(data_version, storage tag, last modified ns) of the current data"""
+        self.refresh()
+        with self._rw.read():
+            return (self.data_version,) + self.storage.state()
+
+    def _apply(self, op):
+        """Apply one storage op, returning its change log event (None if nothing changed)"""
+        sid = op.get('id')
+        if op['op'] == 'add':
+            student = dict(op['data'], id=sid)
+            old = self._table.get(sid)
+            if old is not None:
+                self._unindex(old)
+            self._table.put(sid, student)
+            self._index(student)
+            self.next_id = max(self.next_id, sid + 1)
+        elif op['op'] == 'update':
+            old = self._table.get(sid)
+            if old is None:
+                return
+            self._unindex(old)
+            student = dict(old, **op['data'])
+            self._table.put(sid, student)
+            self._index(student)
+        elif op['op'] == 'delete':
+            old, student = self._table.pop(sid), None
+            if old is None:
+                return
+            self._unindex(old)
+        else:
+            return
+        self.data_version += 1
+        self._notify(op['op'], old, student)
+        if op['op'] == 'add':
+            return {"op": "add", "id": sid, "data": dict(student)}
+        if op['op'] == 'update':
+            changes = diff(old, student)
+            return {"op": "update", "id": sid, "changes": changes} if changes else None
+        return {"op": "delete", "id": sid, "data": dict(old)}
+
+    # ----- change listeners -----
+    def subscribe(self, listener):
+        """Call listener(event, old, new) after every change, including ones from other workers.
+
+        It is first called with ("reset", None, all students), and again
+        whenever the records are reloaded. Runs under the write lock, so keep
+        it quick and do not call back into the manager.
+        """
+        with self._rw.write():
+            self._listeners.append(listener)
+            listener("reset", None, list(self._table.values()))
+
+    def _notify(self, event, old, new):
+        for listener in self._listeners:
+            try:
+                listener(event, old, new)
+            except Exception:
+                log_event("listener_failed", logging.ERROR, exc_info=True, store=type(self).__name__, change=event,
+                          listener=getattr(listener, "__qualname__", repr(listener)))
+
+    # ----- secondary indexes -----
+    @staticmethod
+    def _index_key(value):
+        return str(value).strip().lower() if value is not None else ""
+
+    def _index_entries(self, student):
+        for field in self._indexed:
+            yield field, self._index_key(student.get(field))
+        for token in extract_interests(student.get('interest')):
+            yield 'interest', token.lower()
+
+    def _index(self, student):
+        for field, key in self._index_entries(student):
+            self._indexes[field][key].add(student['id'])
+
+    def _unindex(self, student):
+        for field, key in self._index_entries(student):
+            ids = self._indexes[field][key]
+            ids.discard(student['id'])
+            if not ids:
+                del self._indexes[field][key]
+
+    def _query(self, filters):
+        filters = {f: v for f, v in filters.items() if v}
+        if not filters:
+            return list(self._table.values())
+        matches = []
+        for field, value in filters.items():
+            if field == 'interest':
+                # "ml" finds "Machine Learning"
+                value = canonical_interest(value) or value
+            key = self._index_key(value)
+            if field in self._table.CATEGORICAL:
+                matches.append(self._table.ids_where(field, key))
+            elif field in self._indexes:
+                matches.append(self._indexes[field].get(key, set()))
+            else:
+                raise ValueError(f"Field is not indexed: {field}")
+        ids = set.intersection(*sorted(matches, key=len))
+        return [self._table.get(sid) for sid in sorted(ids)]
+
+    @timed("students.query")
+    def query(self, **filters):
+        """Students matching every given field (email, branch, year, interest), in id order"""
+        self.refresh()
+        with self._rw.read():
+            return self._query(filters)
+
+    @timed("students.find")
+    def find(self, q=None, sort="id", descending=False, **filters):
+        """Indexed filters plus a free-text match over name, email, skills and interest, sorted by one field"""
+        self.refresh()
+        with self._rw.read():
+            students = self._query(filters)
+        if q:
+            q = q.strip().lower()
+            students = [s for s in students
+                        if any(q in str(s.get(f) or "").lower() for f in self.TEXT_FIELDS)]
+        if sort != "id":
+            students = sorted(students, key=lambda s: str(s.get(sort) or "").lower(), reverse=descending)
+        elif descending:
+            students = students[::-1]
+        return students
+
+    def count_by(self, field):
+        """Number of students per normalized value of an indexed field (distinct students for interest)"""
+        self.refresh()
+        with self._rw.read():
+            if field in self._table.CATEGORICAL:
+                return self._table.count_by(field)
+            return Counter({key: len(ids) for key, ids in self._indexes[field].items()})
+
+    def distinct(self, field):
+        """Distinct indexed values of a field"""
+        return list(self.count_by(field))
+
+    def unique_interests(self):
+        self.refresh()
+        return len(self._indexes['interest'])
+
+    def top_interests(self, n):
+        self.refresh()
+        with self._rw.read():
+            return self._table.interest_counts().most_common(n)
+
+    # ----- records -----
+    @property
+    def students(self):
+        return self.all_students()
+
+    def snapshot(self):
+        """Copy of all students, used by the storage backend to write Excel"""
+        with self._rw.read():
+            return [dict(s) for s in self._table.values()]
+
+    def save_to_excel(self):
+        """Flush all pending changes to the Excel file"""
+        self.storage.compact()
+
+    @staticmethod
+    def timestamp():
+        """created_at of a new student, in the format registrations use"""
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    @timed("students.add")
+    def add_student(self, data):
+        with self.storage.transaction(), self._rw.write():
+            self._sync()
+            data['id'] = self.next_id
+            data.setdefault('created_at', self.timestamp())
+            op = {"op": "add", "id": data['id'], "data": data}
+            event = self._apply(op)
+            self.storage.record([op])
+            self.changelog.append([event])
+
+    def add_students(self, rows):
+        """Add many students with consecutive ids in a single storage commit"""
+        return self.apply_batch(creates=rows)[0]
+
+    @timed("students.batch")
+    def apply_batch(self, creates=(), updates=(), deletes=()):
+        """Add students, update them (dicts carrying an "id") and delete ids, in a single storage commit.
+
+        Returns the (added, updated, deleted) ids; updates and deletes of ids
+        that are gone by then are skipped.
+        """
+        with self.storage.transaction(), self._rw.write():
+            self._sync()
+            ops, events, added, updated, deleted = [], [], [], [], []
+            created_at = self.timestamp()
+            for data in creates:
+                data['id'] = self.next_id
+                data.setdefault('created_at', created_at)
+                ops.append({"op": "add", "id": data['id'], "data": data})
+                events.append(self._apply(ops[-1]))
+                added.append(data['id'])
+            for change in updates:
+                sid = change['id']
+                if sid in self._table:
+                    ops.append({"op": "update", "id": sid, "data": {k: v for k, v in change.items() if k != 'id'}})
+                    events.append(self._apply(ops[-1]))
+                    updated.append(sid)
+            for sid in deletes:
+                if sid in self._table:
+                    ops.append({"op": "delete", "id": sid})
+                    events.append(self._apply(ops[-1]))
+                    deleted.append(sid)
+            if ops:
+                self.storage.record(ops)
+                self.changelog.append([e for e in events if e])
+        return added, updated, deleted
+
+    def scan(self, fn):
+        """Call fn(student) for every student under the read lock, without copying the table"""
+        self.refresh()
+        with self._rw.read():
+            for student in self._table.values():
+                fn(student)
+
+    def all_students(self):
+        self.refresh()
+        with self._rw.read():
+            return list(self._table.values())
+
+    def __len__(self):
+        self.refresh()
+        return len(self._table)
+
+    def first_students(self, n):
+        self.refresh()
+        with self._rw.read():
+            return list(islice(self._table.values(), n))
+
+    def get_student(self, sid):
+        self.refresh()
+        with self._rw.read():
+            return self._table.get(sid)
+
+    @timed("students.update")
+    def update_student(self, sid, data):
+        with self.storage.transaction(), self._rw.write():
+            self._sync()
+            if sid not in self._table:
+                return
+            op = {"op": "update", "id": sid, "data": data}
+            event = self._apply(op)
+            self.storage.record([op])
+            if event:
+                self.changelog.append([event])
+
+    @timed("students.delete")
+    def delete_student(self, sid):
+        with self.storage.transaction(), self._rw.write():
+            self._sync()
+            if sid not in self._table:
+                return
+            op = {"op": "delete", "id": sid}
+            event = self._apply(op)
+            self.storage.record([op])
+            self.changelog.append([event])
@@ -0,0 +1,242 @@
+from array import array
+from collections import Counter
+
+
+class DictTable:
+    """Students as one dict per row, keyed by id"""
+    # Fields the table can filter and count itself, see ColumnarTable
+    CATEGORICAL = ()
+
+    def __init__(self, tokenize):
+        self._tokenize = tokenize
+        self._rows = {}
+        self._interests = Counter()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, sid):
+        return sid in self._rows
+
+    def clear(self):
+        self._rows.clear()
+        self._interests.clear()
+
+    def get(self, sid):
+        return self._rows.get(sid)
+
+    def values(self):
+        return self._rows.values()
+
+    def put(self, sid, student):
+        old = self._rows.get(sid)
+        if old is not None:
+            self._forget_interests(old)
+        # Replacing an existing key keeps its position
+        self._rows[sid] = student
+        self._interests.update(self._tokenize(student.get('interest')))
+
+    def pop(self, sid):
+        student = self._rows.pop(sid, None)
+        if student is not None:
+            self._forget_interests(student)
+        return student
+
+    def _forget_interests(self, student):
+        for token in self._tokenize(student.get('interest')):
+            self._interests[token] -= 1
+            if self._interests[token] <= 0:
+                del self._interests[token]
+
+    def interest_counts(self):
+        return self._interests
+
+
+class CategoricalColumn:
+    """Dictionary-encoded column: one small int code per row into a list of distinct values"""
+    def __init__(self):
+        self.categories = []
+        self._code_of = {}
+        self.codes = array('i')
+
+    def encode(self, value):
+        code = self._code_of.get(value)
+        if code is None:
+            code = self._code_of[value] = len(self.categories)
+            self.categories.append(value)
+        return code
+
+    def set(self, row, value):
+        code = self.encode(value)
+        if row == len(self.codes):
+            self.codes.append(code)
+        else:
+            self.codes[row] = code
+
+    def get(self, row):
+        return self.categories[self.codes[row]]
+
+
+class ColumnarTable:
+    """Students stored column by column.
+
+    branch, year and education are dictionary-encoded, so filtering and
+    counting them is a numpy pass over an int array. Interest tokens form a
+    sparse row x token matrix kept as (row, token, generation) triples; an
+    update bumps the row's generation, which retires its old triples without
+    rewriting anything, and the garbage is squeezed out once it dominates.
+    Rows come back as fresh dicts, so callers must go through the manager to
+    change them.
+    """
+    CATEGORICAL = ("branch", "year", "education")
+    PLAIN = ("name", "email", "phone", "skills", "interest", "created_at")
+    # Plain columns left out of a row while empty, since records added before they existed lack them
+    OPTIONAL = ("created_at",)
+    # Column order of materialized rows, matching the entry form
+    ORDER = ("name", "email", "phone", "education", "branch", "year", "skills", "interest")
+
+    def __init__(self, tokenize, normalize):
+        import numpy as np
+        self._np = np
+        self._tokenize = tokenize
+        self._normalize = normalize
+        self.clear()
+
+    def clear(self):
+        self._row_of = {}
+        self._free = []
+        self._ids = array('q')
+        self._alive = bytearray()
+        self._generation = array('i')
+        self._categorical = {f: CategoricalColumn() for f in self.CATEGORICAL}
+        self._plain = {f: [] for f in self.PLAIN}
+        # Columns beyond the usual form fields (e.g. from an imported sheet), rarely present
+        self._extra = []
+        self._tokens = CategoricalColumn()
+        self._pair_row, self._pair_token, self._pair_generation = array('i'), array('i'), array('i')
+        self._live_pairs = 0
+        self._interest_cache = None
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def __contains__(self, sid):
+        return sid in self._row_of
+
+    # ----- rows -----
+    def _materialize(self, row):
+        student = {f: self._plain[f][row] if f in self._plain else self._categorical[f].get(row)
+                   for f in self.ORDER}
+        for f in self.OPTIONAL:
+            if self._plain[f][row] is not None:
+                student[f] = self._plain[f][row]
+        if self._extra[row]:
+            student.update(self._extra[row])
+        student['id'] = self._ids[row]
+        return student
+
+    def get(self, sid):
+        row = self._row_of.get(sid)
+        return None if row is None else self._materialize(row)
+
+    def values(self):
+        return (self._materialize(row) for row in list(self._row_of.values()))
+
+    def put(self, sid, student):
+        row = self._row_of.get(sid)
+        if row is None:
+            row = self._free.pop() if self._free else len(self._ids)
+            self._row_of[sid] = row
+        new = row == len(self._ids)
+        if new:
+            self._ids.append(sid)
+            self._alive.append(1)
+            self._generation.append(0)
+            self._extra.append(None)
+        else:
+            self._ids[row] = sid
+            self._alive[row] = 1
+            self._retire_pairs(row)
+        for f, column in self._categorical.items():
+            column.set(row, student.get(f))
+        for f in self.PLAIN:
+            if new:
+                self._plain[f].append(student.get(f))
+            else:
+                self._plain[f][row] = student.get(f)
+        extra = {k: v for k, v in student.items() if k not in self._plain and k not in self._categorical and k != 'id'}
+        self._extra[row] = extra or None
+        for token in self._tokenize(student.get('interest')):
+            self._pair_row.append(row)
+            self._pair_token.append(self._tokens.encode(token))
+            self._pair_generation.append(self._generation[row])
+            self._live_pairs += 1
+        self._interest_cache = None
+
+    def pop(self, sid):
+        row = self._row_of.pop(sid, None)
+        if row is None:
+            return None
+        student = self._materialize(row)
+        self._alive[row] = 0
+        self._retire_pairs(row)
+        for f in self.PLAIN:
+            self._plain[f][row] = None
+        self._extra[row] = None
+        self._free.append(row)
+        self._interest_cache = None
+        return student
+
+    def _retire_pairs(self, row):
+        self._live_pairs -= len(self._tokenize(self._plain['interest'][row]))
+        self._generation[row] += 1
+        if len(self._pair_row) > 1024 and self._live_pairs * 2 < len(self._pair_row):
+            self._compact_pairs()
+
+    def _compact_pairs(self):
+        np = self._np
+        keep = self._live_pair_mask()
+        for name in ("_pair_row", "_pair_token", "_pair_generation"):
+            column = np.frombuffer(getattr(self, name), dtype=np.int32)[keep]
+            setattr(self, name, array('i', column.tobytes()))
+        self._live_pairs = len(self._pair_row)
+
+    def _live_pair_mask(self):
+        np = self._np
+        rows = np.frombuffer(self._pair_row, dtype=np.int32)
+        generation = np.frombuffer(self._generation, dtype=np.int32)
+        alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+        return alive[rows] & (np.frombuffer(self._pair_generation, dtype=np.int32) == generation[rows])
+
+    # ----- vectorized queries -----
+    def ids_where(self, field, value):
+        """Ids of rows whose categorical field normalizes to value"""
+        np = self._np
+        column = self._categorical[field]
+        codes = [c for c, v in enumerate(column.categories) if self._normalize(v) == value]
+        if not codes or not self._row_of:
+            return set()
+        mask = np.isin(np.frombuffer(column.codes, dtype=np.int32), codes)
+        mask &= np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+        return set(np.frombuffer(self._ids, dtype=np.int64)[mask].tolist())
+
+    def count_by(self, field):
+        """Rows per normalized value of a categorical field"""
+        np = self._np
+        column = self._categorical[field]
+        alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+        counts = np.bincount(np.frombuffer(column.codes, dtype=np.int32)[alive], minlength=len(column.categories))
+        result = Counter()
+        for code in np.flatnonzero(counts).tolist():
+            result[self._normalize(column.categories[code])] += int(counts[code])
+        return result
+
+    def interest_counts(self):
+        if self._interest_cache is None:
+            np = self._np
+            tokens = np.frombuffer(self._pair_token, dtype=np.int32)[self._live_pair_mask()] \
+                if len(self._pair_row) else np.zeros(0, dtype=np.int32)
+            counts = np.bincount(tokens, minlength=len(self._tokens.categories))
+            self._interest_cache = Counter({self._tokens.categories[t]: int(counts[t])
+                                            for t in np.flatnonzero(counts).tolist()})
+        return self._interest_cache
@@ -0,0 +1,177 @@
+import hashlib, json, secrets, threading, time
+from collections import OrderedDict, defaultdict, deque
+
+
+def _digest(token):
+    # Only hashes are stored, a leaked store holds no usable tokens
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class MemoryTokenStore:
+    """Expiring single-use tokens and rate-limit counters in this process only.
+
+    At most capacity tokens are kept; issuing one more evicts the oldest.
+    """
+    def __init__(self, ttl=24 * 3600, capacity=10000):
+        self.ttl = ttl
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        # digest -> (expires, data), in issue order
+        self._tokens = OrderedDict()
+        self._hits = defaultdict(deque)
+
+    def issue(self, data, ttl=None):
+        """Store data under a new random token and return the token"""
+        token = secrets.token_urlsafe(32)
+        with self._lock:
+            self._tokens[_digest(token)] = (time.time() + (ttl or self.ttl), data)
+            while len(self._tokens) > self.capacity:
+                self._tokens.popitem(last=False)
+        return token
+
+    def get(self, token):
+        """Data of a live token, or None"""
+        with self._lock:
+            entry = self._tokens.get(_digest(token))
+            if entry is None or entry[0] <= time.time():
+                return None
+            return entry[1]
+
+    def consume(self, token):
+        """Return a live token's data and invalidate it, so it works only once"""
+        with self._lock:
+            entry = self._tokens.pop(_digest(token), None)
+        if entry is None or entry[0] <= time.time():
+            return None
+        return entry[1]
+
+    def hit(self, key, window):
+        """Count a use of key and return how many uses fell in the last window seconds"""
+        now = time.time()
+        with self._lock:
+            hits = self._hits[key]
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+            hits.append(now)
+            return len(hits)
+
+    def sweep(self, window=24 * 3600):
+        """Drop expired tokens and rate-limit entries older than window, returning how many tokens went"""
+        now = time.time()
+        with self._lock:
+            expired = [d for d, (expires, _) in self._tokens.items() if expires <= now]
+            for d in expired:
+                del self._tokens[d]
+            for key in list(self._hits):
+                hits = self._hits[key]
+                while hits and hits[0] <= now - window:
+                    hits.popleft()
+                if not hits:
+                    del self._hits[key]
+        return len(expired)
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def close(self):
+        pass
+
+
+class SQLiteTokenStore:
+    """The same store kept in a SQLite file, shared by every worker process and kept across restarts"""
+    def __init__(self, db_file, ttl=24 * 3600, capacity=10000):
+        import sqlite3
+        self.db_file = db_file
+        self.ttl = ttl
+        self.capacity = capacity
+        self._db = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None, timeout=30)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS tokens (digest TEXT PRIMARY KEY, expires REAL NOT NULL, data TEXT);
+                CREATE INDEX IF NOT EXISTS tokens_expires ON tokens (expires);
+                CREATE TABLE IF NOT EXISTS hits (key TEXT NOT NULL, ts REAL NOT NULL);
+                CREATE INDEX IF NOT EXISTS hits_key_ts ON hits (key, ts);
+            """)
+
+    def _write(self, *statements):
+        """Run (sql, params) pairs in one write transaction, returning the last cursor's rows"""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, params in statements:
+                    rows = self._db.execute(sql, params).fetchall()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return rows
+
+    def issue(self, data, ttl=None):
+        token = secrets.token_urlsafe(32)
+        self._write(
+            ("INSERT INTO tokens VALUES (?, ?, ?)", (_digest(token), time.time() + (ttl or self.ttl), json.dumps(data))),
+            # Evict the oldest beyond capacity
+            ("DELETE FROM tokens WHERE digest IN (SELECT digest FROM tokens ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+             (self.capacity,)),
+        )
+        return token
+
+    def get(self, token):
+        with self._lock:
+            row = self._db.execute("SELECT data FROM tokens WHERE digest = ? AND expires > ?",
+                                   (_digest(token), time.time())).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def consume(self, token):
+        digest = _digest(token)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute("SELECT data, expires FROM tokens WHERE digest = ?", (digest,)).fetchone()
+                self._db.execute("DELETE FROM tokens WHERE digest = ?", (digest,))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        if row is None or row[1] <= time.time():
+            return None
+        return json.loads(row[0])
+
+    def hit(self, key, window):
+        now = time.time()
+        return self._write(
+            ("DELETE FROM hits WHERE key = ? AND ts <= ?", (key, now - window)),
+            ("INSERT INTO hits VALUES (?, ?)", (key, now)),
+            ("SELECT COUNT(*) FROM hits WHERE key = ?", (key,)),
+        )[0][0]
+
+    def sweep(self, window=24 * 3600):
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                removed = self._db.execute("DELETE FROM tokens WHERE expires <= ?", (now,)).rowcount
+                self._db.execute("DELETE FROM hits WHERE ts <= ?", (now - window,))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return removed
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def make_token_store(backend="sqlite", db_file="tokens.db", ttl=24 * 3600, capacity=10000):
+    if backend == "memory":
+        return MemoryTokenStore(ttl, capacity)
+    if backend == "sqlite":
+        return SQLiteTokenStore(db_file, ttl, capacity)
+    raise ValueError(f"Unknown token store: {backend}")
@@ -0,0 +1,202 @@
+import hmac, logging, threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+from metrics import log_event, timed
+
+# Prefixes written by werkzeug's generate_password_hash
+HASH_PREFIXES = ("pbkdf2:", "scrypt:")
+
+
+def is_hashed(password):
+    return isinstance(password, str) and password.startswith(HASH_PREFIXES)
+
+
+class LoginsBusy(Exception):
+    """Every verification slot is taken; the caller should answer 503 rather than wait"""
+
+
+def same_password(stored, password):
+    """Constant-time comparison of plaintext passwords; compare_digest rejects non-ASCII str, so compare bytes"""
+    return hmac.compare_digest(str(stored).encode("utf-8"), password.encode("utf-8"))
+
+
+class UserStore:
+    """Registered users indexed by username and email.
+
+    Passwords are stored as salted slow hashes. Hashing and verification run
+    on a small dedicated pool, which caps how many CPU cores a burst of logins
+    can spend on hashing. Since the request thread waits for its result, at
+    most login_slots logins verify at once and authenticate() raises
+    LoginsBusy past that, so logins hold only a fixed share of request
+    threads. Plaintext passwords left over in old workbooks are still
+    accepted and re-hashed on the next successful login.
+
+    Lookups first pick up registrations committed by other worker processes.
+    Built-in accounts ({login: account}) are checked after the registered
+    users and are never written to storage.
+    """
+    def __init__(self, storage, hash_method="pbkdf2:sha256:600000", hash_workers=2, builtin=None, login_slots=4):
+        self.storage = storage
+        self.hash_method = hash_method
+        self.builtin = builtin or {}
+        self._pool = ThreadPoolExecutor(max_workers=hash_workers, thread_name_prefix="password-hash")
+        self._login_slots = threading.BoundedSemaphore(login_slots)
+        self._lock = threading.RLock()
+        self._by_username = {}
+        self._by_email = {}
+        self._listeners = []
+        self.load()
+        self.storage.attach(self.snapshot)
+
+    def load(self):
+        with self.storage.transaction(), self._lock:
+            self._by_username, self._by_email = {}, {}
+            for user in self.storage.load():
+                self._put(user)
+            self._notify("reset", None, list(self._by_username.values()))
+
+    def _put(self, user):
+        user['username'] = str(user['username'])
+        user['email'] = str(user.get('email') or '').strip().lower()
+        old = self._by_username.get(user['username'])
+        if old is not None and self._by_email.get(old['email']) is old:
+            del self._by_email[old['email']]
+        self._by_username[user['username']] = user
+        if user['email']:
+            self._by_email[user['email']] = user
+        return old
+
+    def subscribe(self, listener):
+        """Call listener(event, old, new) after every change, starting with ("reset", None, all users)"""
+        with self._lock:
+            self._listeners.append(listener)
+            listener("reset", None, list(self._by_username.values()))
+
+    def _notify(self, event, old, new):
+        for listener in self._listeners:
+            try:
+                listener(event, old, new)
+            except Exception:
+                log_event("listener_failed", logging.ERROR, exc_info=True, store=type(self).__name__, change=event,
+                          listener=getattr(listener, "__qualname__", repr(listener)))
+
+    def _sync(self):
+        """Apply what other workers committed; needs the storage transaction and the lock"""
+        ops = self.storage.changes()
+        if ops is None:
+            self.load()
+            return
+        for op in ops:
+            if op['op'] == 'add':
+                user = dict(op['data'])
+                self._notify("add", self._put(user), user)
+            elif op['op'] == 'update' and op['id'] in self._by_username:
+                user = self._by_username[op['id']]
+                old = dict(user)
+                user.update(op['data'])
+                self._notify("update", old, user)
+
+    def refresh(self):
+        if self.storage.has_changes():
+            with self.storage.transaction(), self._lock:
+                self._sync()
+
+    def snapshot(self):
+        with self._lock:
+            return [dict(u) for u in self._by_username.values()]
+
+    def __len__(self):
+        self.refresh()
+        return len(self._by_username)
+
+    def all_users(self):
+        self.refresh()
+        with self._lock:
+            return list(self._by_username.values())
+
+    def get_by_username(self, username):
+        self.refresh()
+        return self._by_username.get(username)
+
+    def get_by_email(self, email):
+        self.refresh()
+        email = (email or '').strip().lower()
+        return self._by_email.get(email) or self.builtin.get(email)
+
+    def find(self, login):
+        """Look a user up by username or email, then among the built-in accounts"""
+        return self.get_by_username(login) or self.get_by_email(login) or self.builtin.get(login)
+
+    @timed("users.hash_password")
+    def hash_password(self, password):
+        return self._pool.submit(generate_password_hash, password, self.hash_method).result()
+
+    def _check(self, stored, password):
+        if is_hashed(stored):
+            return check_password_hash(stored, password)
+        return same_password(stored, password)
+
+    def _verify(self, stored, password):
+        if not self._login_slots.acquire(blocking=False):
+            raise LoginsBusy()
+        try:
+            return self._pool.submit(self._check, stored, password).result()
+        finally:
+            self._login_slots.release()
+
+    @timed("users.authenticate")
+    def authenticate(self, login, password):
+        """Return a copy of the user (without the password) if the credentials match.
+
+        Raises LoginsBusy instead of waiting when login_slots verifications are already running.
+        """
+        if not password:
+            return None
+        user = self.get_by_username(login) or self._by_email.get((login or '').strip().lower())
+        if user is not None and self._verify(user.get('password'), password):
+            if not is_hashed(user.get('password')):
+                self._set_password(user, password)
+        else:
+            user = self.builtin.get(login)
+            if user is None or not same_password(user['password'], password):
+                return None
+        return {k: v for k, v in user.items() if k != 'password'}
+
+    @timed("users.add")
+    def add_user(self, user_data):
+        """Register a new user, returning False if the username or email is taken"""
+        user = dict(user_data, password=self.hash_password(user_data['password']))
+        user['email'] = user['email'].strip().lower()
+        with self.storage.transaction(), self._lock:
+            self._sync()
+            if user['username'] in self._by_username or user['email'] in self._by_email:
+                return False
+            self._put(user)
+            self.storage.record([{"op": "add", "id": user['username'], "data": user}])
+            self._notify("add", None, user)
+        return True
+
+    def set_password(self, email, new_password):
+        email = (email or '').strip().lower()
+        if email in self.builtin:
+            self.builtin[email]['password'] = new_password
+        self.refresh()
+        user = self._by_email.get(email)
+        if user is None:
+            return email in self.builtin
+        self._set_password(user, new_password)
+        return True
+
+    def _set_password(self, user, password):
+        hashed = self.hash_password(password)
+        with self.storage.transaction(), self._lock:
+            self._sync()
+            user = self._by_username.get(user['username'], user)
+            old = dict(user)
+            user['password'] = hashed
+            self.storage.record([{"op": "update", "id": user['username'], "data": {"password": hashed}}])
+            self._notify("update", old, user)
+
+    def close(self):
+        self._pool.shutdown()
+        self.storage.close()